@@ -11,6 +11,7 @@ from app.database import get_db
 from app.models import Note, Conversation, Document
 from app.agents.voice_agent import get_agent
 from app.services.vector_store import get_vector_store
+from app.tools._rag_cache import invalidate_rag_caches
 from app.config import get_settings
 import shutil
 from pathlib import Path
@@ -303,6 +304,8 @@ async def upload_document(
         # Update document status
         if ingestion_result["status"] == "success":
             db_doc.status = "processed"
+            # Cached RAG answers for this session may now be incomplete
+            invalidate_rag_caches(session_id)
             logger.info(f"Successfully ingested document: {file.filename}")
             message = f"Document processed and added to knowledge base ({ingestion_result['chunks']} chunks created)"
         else:
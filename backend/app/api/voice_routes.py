@@ -11,10 +11,12 @@ from app.models import Conversation
 import logging
 import base64
 import tempfile
+import shutil
 import os
 from typing import Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
 from fastapi.responses import Response, FileResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -94,8 +96,7 @@ async def transcribe_audio(
     try:
         # Save uploaded file temporarily
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(audio_file.filename)[1])
-        content = await audio_file.read()
-        temp_file.write(content)
+        await run_in_threadpool(shutil.copyfileobj, audio_file.file, temp_file)
         temp_file.close()
 
         # Get STT service
@@ -211,8 +212,7 @@ async def voice_chat(
             delete=False,
             suffix=os.path.splitext(audio_file.filename)[1]
         )
-        content = await audio_file.read()
-        temp_file.write(content)
+        await run_in_threadpool(shutil.copyfileobj, audio_file.file, temp_file)
         temp_file.close()
 
         # Step 2: Transcribe audio (STT)
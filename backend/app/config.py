@@ -3,6 +3,7 @@ Configuration settings for the Voice Assistant application.
 """
 import os
 from pathlib import Path
+from typing import List
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -25,6 +26,8 @@ class Settings(BaseSettings):
     # API Keys
     GEMINI_API_KEY: str = ""  # Main agent/chat API key (set via .env file)
     GEMINI_SEARCH_API_KEY: str = ""  # Separate API key for Gemini web search with Google Search grounding (optional, falls back to GEMINI_API_KEY)
+    GEMINI_SEARCH_API_KEYS: List[str] = []  # Optional pool of web search keys (JSON list in .env); each request goes to the least-loaded key
+    GEMINI_SEARCH_MAX_CONCURRENCY: int = 8  # Max in-flight async Gemini web search requests per API key
     TAVILY_API_KEY: str = ""  # Tavily API key for real-time web search - 1,000 free searches/month (get from https://tavily.com)
 
     # Database (Neon PostgreSQL)
@@ -49,14 +52,31 @@ class Settings(BaseSettings):
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
     TOP_K_RESULTS: int = 3
+    DEDUP_CHUNKS: bool = True  # Drop chunks whose normalized text was already ingested from the same document
+    RAG_RESULT_MAX_CHARS: int = 1500  # Cap on chunk text shown to the LLM per result (cut at a sentence end); 0 = no limit
+    RAG_RESULT_DEDUP_THRESHOLD: float = 0.85  # Drop results whose shingle Jaccard overlap with a kept result exceeds this
+    RAG_SEMANTIC_CACHE_ENABLED: bool = True  # Reuse answers to paraphrased questions in the same session
+    RAG_SEMANTIC_CACHE_THRESHOLD: float = 0.93  # Minimum cosine similarity for a cache hit
+    RAG_SEMANTIC_CACHE_MAX_SIZE: int = 1024
+
+    # Web Search Cache (semantic cache in front of Gemini grounded search)
+    WEB_SEARCH_CACHE_ENABLED: bool = True
+    WEB_SEARCH_CACHE_EMBEDDING_MODEL: str = "text-embedding-004"
+    WEB_SEARCH_CACHE_THRESHOLD: float = 0.92  # Minimum cosine similarity for a cache hit
+    WEB_SEARCH_CACHE_TTL_SECONDS: int = 3600
+    WEB_SEARCH_CACHE_MAX_SIZE: int = 512
 
     # Documents
     DOCUMENTS_DIR: str = str(BASE_DIR / "data" / "documents")
 
+    # Command execution: file commands (ls, mkdir, rename, ...) run in and are confined to this directory
+    COMMAND_WORKSPACE_DIR: str = str(BASE_DIR / "data" / "workspace")
+
     # Voice Settings
     ASR_MODEL: str = "medium"  # Whisper model size
     TTS_MODEL: str = "tts_models/en/ljspeech/glow-tts"
     AUDIO_SAMPLE_RATE: int = 16000
+    PRELOAD_VOICE_SERVICES: bool = True  # Load Whisper and the TTS voice list in the background at startup; disable if voice is unused
 
     # Server
     HOST: str = "0.0.0.0"
@@ -91,6 +111,7 @@ def create_directories():
         BASE_DIR / "data" / "documents",
         BASE_DIR / "data" / "chroma_db",
         BASE_DIR / "data" / "user_notes",
+        BASE_DIR / "data" / "workspace",
     ]
     for dir_path in dirs:
         dir_path.mkdir(parents=True, exist_ok=True)
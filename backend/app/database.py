@@ -1,7 +1,9 @@
 """
 PostgreSQL database setup using SQLAlchemy (Neon serverless database).
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
@@ -37,6 +39,40 @@ autoflush=False → prevents SQLAlchemy from automatically sending pending chang
 """
 
 
+def _async_database_url(url: str) -> URL:
+    """
+    Map the sync DATABASE_URL onto its asyncio driver.
+
+    postgresql(+psycopg2) -> postgresql+asyncpg. asyncpg takes `ssl` instead of libpq's `sslmode` and has no `channel_binding`
+    option, so Neon connection strings are rewritten accordingly.
+    """
+    async_url = make_url(url)
+
+    if async_url.drivername in ("postgres", "postgresql", "postgresql+psycopg2"):
+        query = dict(async_url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            query["ssl"] = sslmode
+        async_url = async_url.set(drivername="postgresql+asyncpg", query=query)
+
+    return async_url
+
+
+# Async engine for code running on the event loop (e.g. tool _arun methods),
+# so DB round-trips don't block other requests
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    echo=settings.DEBUG
+)
+
+# expire_on_commit=False so ORM objects stay readable after commit without a lazy reload
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
 # Base class for models
 # Creates a base class that all ORM models (tables) will inherit from.
 Base = declarative_base()
@@ -56,6 +92,17 @@ def get_db():  # Safely provides a database session to FastAPI routes
 
 def init_db(): # Creates the actual database tables.
     """Initialize database - create all tables."""
-    from app.models import Note, Conversation, Document  # Import models
+    from app.models import Note, Conversation, Document, NOTE_FTS_EXPRESSION  # Import models
     Base.metadata.create_all(bind=engine)
+
+    # create_all() doesn't alter existing tables, so add the notes full-text
+    # column/index to databases created before it existed (no-op otherwise)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE notes ADD COLUMN IF NOT EXISTS content_tsv tsvector "
+            f"GENERATED ALWAYS AS ({NOTE_FTS_EXPRESSION}) STORED"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS notes_fts_idx ON notes USING GIN (content_tsv)"
+        ))
     print("Database initialized successfully!")
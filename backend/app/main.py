@@ -4,23 +4,65 @@ Main FastAPI application for Voice Assistant.
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+import asyncio
+import atexit
 import logging
+import queue
 
 from app.config import get_settings, create_directories
-from app.database import init_db
+from app.database import init_db, async_engine
 from app.api import routes
 from app.api.voice_routes import router as voice_router
+from app.services.speech_to_text import get_stt_service
+from app.services.text_to_speech import get_tts_service
+from app.tools import tavily_search, weather
+
+# Configure logging. Records are formatted by the QueueHandler and written to
+# stderr by a listener thread, so request handlers never block on console I/O.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
 
+async def preload_voice_services():
+    """
+    Load the Whisper model and fetch the TTS voice list before the first voice request.
+
+    Runs as a background task so startup (and /health) does not wait on a model
+    download. Model loading is CPU/disk-bound and runs in a worker thread while
+    the voice list is fetched over the network; the loaded model is then warmed
+    up in the same background task. Failures are logged, not raised: the
+    services load lazily on first use anyway.
+    """
+    results = await asyncio.gather(
+        asyncio.to_thread(get_stt_service, model_size="base"),
+        get_tts_service().get_available_voices(),
+        return_exceptions=True
+    )
+
+    for name, result in zip(("STT model", "TTS voice list"), results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not preload {name}: {str(result)}")
+
+    stt = results[0]
+    if not isinstance(stt, Exception):
+        try:
+            await asyncio.to_thread(stt.warm_up)
+        except Exception as e:
+            logger.warning(f"Could not warm up STT model: {str(e)}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -30,12 +72,22 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting Voice Assistant Backend...")
     create_directories()
     init_db()
+
+    preload_task = None
+    if settings.PRELOAD_VOICE_SERVICES:
+        preload_task = asyncio.create_task(preload_voice_services())
+
     logger.info("✅ Application startup complete!")
 
     yield
 
     # Shutdown
     logger.info("👋 Shutting down Voice Assistant Backend...")
+    if preload_task is not None and not preload_task.done():
+        preload_task.cancel()
+    await async_engine.dispose()
+    await weather.close_async_client()
+    await tavily_search.close_async_client()
 
 
 # Create FastAPI app
@@ -61,9 +113,9 @@ app.include_router(routes.router, prefix="/api")
 app.include_router(voice_router)  # Voice routes already have /api prefix
 
 
-@app.get("/")
+@app.api_route("/", methods=["GET", "HEAD"])
 async def root():
-    """Root endpoint - health check."""
+    """Root endpoint - health check (HEAD for cheap liveness probes)."""
     return {
         "status": "online",
         "app": settings.APP_NAME,
@@ -72,9 +124,9 @@ async def root():
     }
 
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (HEAD for cheap liveness probes)."""
     return {
         "status": "healthy",
         "database": "connected",
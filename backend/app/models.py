@@ -1,9 +1,14 @@
 """
 SQLAlchemy database models for the Voice Assistant.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Computed, Index, Integer, String, Text, DateTime, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.database import Base
 
+# Text indexed for note full-text search (title + content, English stemming)
+NOTE_FTS_EXPRESSION = "to_tsvector('english', coalesce(title, '') || ' ' || content)"
+
 
 class Note(Base):
     """Model for storing user notes."""
@@ -18,6 +23,13 @@ class Note(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Generated by Postgres; deferred so it's only loaded when a query references it
+    content_tsv = deferred(Column(TSVECTOR, Computed(NOTE_FTS_EXPRESSION, persisted=True)))
+
+    __table_args__ = (
+        Index("notes_fts_idx", "content_tsv", postgresql_using="gin"),
+    )
+
     def __repr__(self):
         return f"<Note(id={self.id}, filename='{self.filename}', title='{self.title}')>"
 
@@ -0,0 +1,173 @@
+"""
+Query embedding cache.
+
+Embedding a query is the most expensive step of a RAG search that does not
+re-rank, and a network round trip for remote embedding APIs. Identical query
+texts ("summarize this doc", retried chat turns, repeated web searches) are
+embedded once and reused for up to an hour.
+
+Keys are sha256(model name + normalized text), so different models never
+share vectors. Shared by every tool through get_embedding_cache().
+"""
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+import hashlib
+import threading
+import time
+import logging
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Thread-safe LRU cache of query embeddings with per-entry expiry.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl_seconds: float = 3600):
+        """
+        Args:
+            max_size: Maximum number of cached embeddings
+            ttl_seconds: How long an embedding stays valid
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # key -> (expiry, vector), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the cache key for a model and query text (whitespace-normalized)."""
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{model_name}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, model_name: str, text: str) -> Optional[List[float]]:
+        """
+        Get a cached embedding.
+
+        Returns:
+            Cached vector, or None on miss or expiry
+        """
+        key = self.make_key(model_name, text)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, model_name: str, text: str, vector: Sequence[float]) -> None:
+        """Cache an embedding, evicting the least recently used entry if full."""
+        key = self.make_key(model_name, text)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, list(vector))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        model_name: str,
+        text: str,
+        compute: Callable[[], Sequence[float]]
+    ) -> List[float]:
+        """
+        Return the cached embedding, or compute and cache it.
+
+        The embedding is computed outside the lock, so concurrent misses for the
+        same text may both compute; the last one wins.
+        """
+        vector = self.get(model_name, text)
+        if vector is None:
+            vector = list(compute())
+            self.set(model_name, text, vector)
+        return vector
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain Embeddings wrapper that serves embed_query from the shared cache.
+
+    Document embeddings (ingestion) are passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str):
+        """
+        Args:
+            embeddings: Underlying embeddings model
+            model_name: Name used to namespace cache keys
+        """
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = get_embedding_cache()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.cache.get_or_compute(
+            self.model_name, text, lambda: self.embeddings.embed_query(text)
+        )
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries, computing all cache misses in one model call.
+
+        Misses go through embed_documents, which for the symmetric models used
+        here (no query instruction) gives the same vectors as embed_query.
+        """
+        vectors = [self.cache.get(self.model_name, text) for text in texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = list(vector)
+                self.cache.set(self.model_name, texts[i], vector)
+
+        return vectors
+
+
+# Singleton instance
+_embedding_cache_instance = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get or create the query embedding cache instance (singleton).
+
+    Returns:
+        EmbeddingCache instance
+    """
+    global _embedding_cache_instance
+
+    if _embedding_cache_instance is None:
+        _embedding_cache_instance = EmbeddingCache()
+
+    return _embedding_cache_instance
@@ -9,10 +9,15 @@ Why Re-ranking?
 """
 from typing import List, Dict
 from sentence_transformers import CrossEncoder
+import torch
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of query-document pairs scored per cross-encoder forward pass.
+# Candidates are retrieved as k*5 (15 by default), so one batch covers them all.
+RERANK_BATCH_SIZE = 64
+
 
 class ReRanker:
     """
@@ -63,9 +68,18 @@ class ReRanker:
         logger.info(f"Loading re-ranker model: {model_name}")
 
         try:
-            self.model = CrossEncoder(model_name, max_length=512)
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            # Half precision on GPU roughly doubles cross-encoder throughput
+            automodel_args = {"torch_dtype": torch.float16} if device == "cuda" else None
+
+            self.model = CrossEncoder(
+                model_name,
+                max_length=512,
+                device=device,
+                automodel_args=automodel_args
+            )
             self.model_name = model_name
-            logger.info("Re-ranker model loaded successfully")
+            logger.info(f"Re-ranker model loaded successfully (device: {device})")
         except Exception as e:
             logger.error(f"Failed to load re-ranker model: {e}")
             logger.info("Re-ranking will be disabled")
@@ -93,13 +107,18 @@ class ReRanker:
             return documents[:top_k]
 
         try:
-            logger.info(f"Re-ranking {len(documents)} documents for query: {query[:50]}...")
+            logger.info("Re-ranking %d documents for query: %.50s...", len(documents), query)
 
             # Prepare query-document pairs
             pairs = [[query, doc['content']] for doc in documents]
 
-            # Get cross-encoder scores
-            scores = self.model.predict(pairs)
+            # Score all pairs in a single batched forward pass
+            scores = self.model.predict(
+                pairs,
+                batch_size=RERANK_BATCH_SIZE,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
 
             # Add rerank scores to documents
             for idx, doc in enumerate(documents):
@@ -114,7 +133,7 @@ class ReRanker:
             # Return top-k
             top_results = reranked[:top_k]
 
-            logger.info(f"Re-ranking complete. Top result score: {top_results[0]['rerank_score']:.3f}")
+            logger.info("Re-ranking complete. Top result score: %.3f", top_results[0]['rerank_score'])
 
             return top_results
 
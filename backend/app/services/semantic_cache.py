@@ -0,0 +1,199 @@
+"""
+Semantic response cache.
+
+Caches responses keyed by query embedding instead of exact query text, so
+paraphrased queries ("weather in Paris" vs "Paris weather") can reuse a
+previous answer.
+
+How it works:
+1. Caller embeds the query (any model, vectors are L2-normalized here)
+2. lookup() computes cosine similarity against all cached queries in one
+   matrix-vector product
+3. If the best match is above the threshold and not expired, its response
+   is returned
+4. Otherwise the caller computes the response and store()s it
+
+Entries can carry a context (e.g. the session a follow-up question was asked
+in) so that context-dependent queries only match within that context, and
+metadata that invalidate() predicates can use to drop entries that went stale
+after a write (e.g. a note was saved or edited).
+"""
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+import threading
+import time
+import logging
+import weakref
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Every live cache, so writers can invalidate entries without knowing which caches exist
+_all_caches: "weakref.WeakSet[SemanticCache]" = weakref.WeakSet()
+
+
+class SemanticCache:
+    """
+    In-memory cache of responses keyed by query embeddings.
+
+    Entries expire after `ttl_seconds`. When `max_size` is reached, the least
+    recently used entry is evicted. Thread-safe.
+    """
+
+    def __init__(self, threshold: float = 0.92, ttl_seconds: float = 3600, max_size: int = 512):
+        """
+        Initialize an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: How long an entry stays valid
+            max_size: Maximum number of cached entries
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None  # shape [N, d], L2-normalized rows
+        self._responses: List[str] = []
+        self._expiry: List[float] = []
+        self._last_used: List[float] = []
+        self._contexts: List[Hashable] = []
+        self._metadata: List[Dict[str, Any]] = []
+
+        self.hits = 0
+        self.misses = 0
+
+        _all_caches.add(self)
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def lookup(self, vector: Sequence[float], context: Hashable = None) -> Optional[str]:
+        """
+        Find a cached response for a query embedding.
+
+        Args:
+            vector: Query embedding
+            context: Only entries stored with the same context can match
+
+        Returns:
+            Cached response, or None on miss
+        """
+        query = self._normalize(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._vectors is None or not self._responses:
+                self.misses += 1
+                return None
+
+            scores = self._vectors @ query
+            scores[[c != context for c in self._contexts]] = -np.inf
+            best = int(np.argmax(scores))
+
+            if scores[best] >= self.threshold and self._expiry[best] > now:
+                self._last_used[best] = now
+                self.hits += 1
+                return self._responses[best]
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        vector: Sequence[float],
+        response: str,
+        context: Hashable = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Add a response for a query embedding.
+
+        Args:
+            vector: Query embedding
+            response: Response to cache
+            context: Context the response is valid in (None = any lookup without context)
+            metadata: Tags for invalidate() predicates (e.g. tool name, query)
+        """
+        row = self._normalize(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            self._drop_expired(now)
+
+            if len(self._responses) >= self.max_size:
+                self._remove(int(np.argmin(self._last_used)))
+
+            if self._vectors is None or not self._responses:
+                self._vectors = row[np.newaxis, :]
+            else:
+                self._vectors = np.vstack([self._vectors, row])
+            self._responses.append(response)
+            self._expiry.append(now + self.ttl_seconds)
+            self._last_used.append(now)
+            self._contexts.append(context)
+            self._metadata.append(metadata or {})
+
+    def invalidate(self, predicate: Callable[[Dict[str, Any]], bool]) -> int:
+        """
+        Remove entries whose metadata matches a predicate.
+
+        Args:
+            predicate: Called with each entry's metadata; True drops the entry
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [idx for idx, meta in enumerate(self._metadata) if predicate(meta)]
+            for idx in reversed(stale):
+                self._remove(idx)
+
+        if stale:
+            logger.info(f"Invalidated {len(stale)} semantic cache entries")
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._vectors = None
+            self._responses.clear()
+            self._expiry.clear()
+            self._last_used.clear()
+            self._contexts.clear()
+            self._metadata.clear()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def _drop_expired(self, now: float) -> None:
+        # Caller must hold the lock
+        for idx in range(len(self._expiry) - 1, -1, -1):
+            if self._expiry[idx] <= now:
+                self._remove(idx)
+
+    def _remove(self, idx: int) -> None:
+        # Caller must hold the lock
+        self._vectors = np.delete(self._vectors, idx, axis=0)
+        del self._responses[idx]
+        del self._expiry[idx]
+        del self._last_used[idx]
+        del self._contexts[idx]
+        del self._metadata[idx]
+
+
+def invalidate_caches(predicate: Callable[[Dict[str, Any]], bool]) -> int:
+    """
+    Remove matching entries from every live SemanticCache.
+
+    Args:
+        predicate: Called with each entry's metadata; True drops the entry
+
+    Returns:
+        Total number of entries removed
+    """
+    return sum(cache.invalidate(predicate) for cache in list(_all_caches))
@@ -13,17 +13,56 @@ Features:
 """
 import os
 import logging
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
 from io import BytesIO
+from math import gcd
 import tempfile
 
 from faster_whisper import WhisperModel
 from pydub import AudioSegment
+from scipy.signal import resample_poly
+import numpy as np
 import soundfile as sf
 
 logger = logging.getLogger(__name__)
 
+# Sample rate Whisper expects
+TARGET_SAMPLE_RATE = 16000
+
+# Formats libsndfile can decode in-process (no ffmpeg); others go through pydub
+SOUNDFILE_FORMATS = {'.flac', '.ogg', '.mp3'}
+
+# Peak level AudioSegment.normalize() targets (0.1 dB headroom)
+_NORMALIZE_PEAK = 10 ** (-0.1 / 20)
+
+# CTranslate2 intra-op threads for CPU inference. Its own default is 4 threads;
+# leave one core for the event loop and audio conversion.
+DEFAULT_CPU_THREADS = max(1, (os.cpu_count() or 1) - 1)
+
+
+def _convert_with_soundfile(audio_path: str, output_path: str) -> None:
+    """
+    Convert audio to 16 kHz mono 16-bit WAV with soundfile + NumPy.
+
+    Mirrors the pydub path (mono, resample, peak normalize) without spawning ffmpeg.
+    Raises whatever soundfile raises if it cannot decode the file.
+    """
+    data, sample_rate = sf.read(audio_path, always_2d=True, dtype='float32')
+    mono = data.mean(axis=1)
+
+    if sample_rate != TARGET_SAMPLE_RATE:
+        g = gcd(sample_rate, TARGET_SAMPLE_RATE)
+        mono = resample_poly(mono, TARGET_SAMPLE_RATE // g, sample_rate // g)
+
+    # Normalize after resampling so filter overshoot cannot clip
+    peak = np.abs(mono).max() if mono.size else 0.0
+    if peak > 0:
+        mono *= _NORMALIZE_PEAK / peak
+
+    sf.write(output_path, mono, TARGET_SAMPLE_RATE, subtype='PCM_16')
+
 
 class SpeechToTextService:
     """
@@ -37,7 +76,9 @@ class SpeechToTextService:
         self,
         model_size: str = "base",
         device: str = "cpu",
-        compute_type: str = "int8"
+        compute_type: str = "int8",
+        cpu_threads: int = DEFAULT_CPU_THREADS,
+        num_workers: int = 1
     ):
         """
         Initialize the STT service.
@@ -46,10 +87,15 @@ class SpeechToTextService:
             model_size: Whisper model size (tiny, base, small, medium, large)
             device: Device to run on (cpu, cuda)
             compute_type: Computation type (int8, float16, float32)
+            cpu_threads: Threads per transcription on CPU
+            num_workers: Transcriptions that can run in parallel when
+                transcribe() is called from several threads
         """
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
         self.model = None
 
         # Supported audio formats
@@ -64,13 +110,34 @@ class SpeechToTextService:
             self.model = WhisperModel(
                 self.model_size,
                 device=self.device,
-                compute_type=self.compute_type
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers
+            )
+            logger.info(
+                f"Whisper model '{self.model_size}' loaded successfully "
+                f"({self.cpu_threads} CPU threads, {self.num_workers} worker(s))"
             )
-            logger.info(f"Whisper model '{self.model_size}' loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load Whisper model: {str(e)}")
             raise
 
+    def warm_up(self):
+        """
+        Run one transcription of a second of silence.
+
+        The first transcription after loading pages the weights in and
+        initializes the inference kernels, which costs seconds; doing it up
+        front keeps that off the first user request.
+        """
+        if not self.model:
+            raise RuntimeError("Whisper model not loaded")
+
+        silence = np.zeros(TARGET_SAMPLE_RATE, dtype=np.float32)
+        segments, _ = self.model.transcribe(silence, language="en", beam_size=1)
+        list(segments)  # segments are decoded lazily
+        logger.info(f"Whisper model '{self.model_size}' warmed up")
+
     def _convert_to_wav(self, audio_path: str) -> str:
         """
         Convert audio file to WAV format if needed.
@@ -87,6 +154,18 @@ class SpeechToTextService:
         if file_ext == '.wav':
             return audio_path
 
+        # Fast path: decode and resample in-process
+        if file_ext in SOUNDFILE_FORMATS:
+            temp_wav = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+            temp_wav.close()
+            try:
+                _convert_with_soundfile(audio_path, temp_wav.name)
+                logger.info(f"Audio converted to WAV (soundfile): {temp_wav.name}")
+                return temp_wav.name
+            except Exception as e:
+                os.unlink(temp_wav.name)
+                logger.debug(f"soundfile could not convert {file_ext}, falling back to pydub: {e}")
+
         try:
             logger.info(f"Converting {file_ext} to WAV...")
 
@@ -112,7 +191,7 @@ class SpeechToTextService:
             audio.export(
                 temp_wav.name,
                 format='wav',
-                parameters=["-ar", "16000"]  # 16kHz sample rate
+                parameters=["-ar", str(TARGET_SAMPLE_RATE)]  # 16kHz sample rate
             )
 
             logger.info(f"Audio converted to WAV: {temp_wav.name}")
@@ -342,6 +421,8 @@ class SpeechToTextService:
 
 # Singleton instance
 _stt_service = None
+# The model may be loaded by the startup preload thread and a request at once
+_stt_service_lock = threading.Lock()
 
 
 def get_stt_service(
@@ -361,10 +442,12 @@ def get_stt_service(
     global _stt_service
 
     if _stt_service is None:
-        _stt_service = SpeechToTextService(
-            model_size=model_size,
-            device=device
-        )
+        with _stt_service_lock:
+            if _stt_service is None:
+                _stt_service = SpeechToTextService(
+                    model_size=model_size,
+                    device=device
+                )
 
     return _stt_service
 
@@ -12,6 +12,8 @@ Features:
 - Voice customization (rate, pitch, volume)
 """
 import os
+import json
+import time
 import logging
 import asyncio
 from typing import Optional, List, Dict
@@ -22,6 +24,10 @@ import edge_tts
 
 logger = logging.getLogger(__name__)
 
+# The Edge-TTS voice catalogue rarely changes; keep a copy across restarts
+VOICES_CACHE_PATH = Path(tempfile.gettempdir()) / "edge_tts_voices.json"
+VOICES_CACHE_TTL_SECONDS = 24 * 60 * 60
+
 
 class TextToSpeechService:
     """
@@ -65,13 +71,38 @@ class TextToSpeechService:
         Returns:
             List of voice dictionaries with metadata
         """
+        if self.available_voices is None:
+            self.available_voices = self._load_cached_voices()
+
         if self.available_voices is None:
             logger.info("Fetching available voices...")
             self.available_voices = await edge_tts.list_voices()
             logger.info(f"Found {len(self.available_voices)} voices")
+            self._save_cached_voices(self.available_voices)
 
         return self.available_voices
 
+    @staticmethod
+    def _load_cached_voices() -> Optional[List[Dict]]:
+        """Read the voice list from disk if it was fetched within the TTL."""
+        try:
+            if time.time() - VOICES_CACHE_PATH.stat().st_mtime >= VOICES_CACHE_TTL_SECONDS:
+                return None
+            voices = json.loads(VOICES_CACHE_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        logger.info(f"Loaded {len(voices)} voices from {VOICES_CACHE_PATH}")
+        return voices
+
+    @staticmethod
+    def _save_cached_voices(voices: List[Dict]) -> None:
+        """Write the voice list to disk; failures only cost a refetch next time."""
+        try:
+            VOICES_CACHE_PATH.write_text(json.dumps(voices), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not cache voice list: {str(e)}")
+
     async def get_voices_by_language(self, language_code: str) -> List[Dict]:
         """
         Get voices for a specific language.
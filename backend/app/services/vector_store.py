@@ -11,17 +11,61 @@ This module handles:
 from langchain_chroma import Chroma
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
-from typing import List, Optional, Literal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Literal, Set
+from collections import defaultdict
+from itertools import islice
+import hashlib
 import logging
+import time
 from pathlib import Path
 
 from app.config import get_settings
 from app.services.chunking import ChunkingStrategy
+from app.services.embedding_cache import CachedEmbeddings
 from app.services.reranking import get_reranker
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# How long collection stats are reused before Chroma is asked again
+STATS_CACHE_TTL_SECONDS = 5.0
+
+# Document loaders by file type (extend here to support new formats)
+_LOADERS = {
+    "pdf": PyPDFLoader,
+    "txt": TextLoader,
+}
+
+# Most filter values per field remembered as matching nothing (e.g. sessions without uploads)
+METADATA_MISS_CACHE_SIZE = 1024
+
+# Number of loaded pages chunked and embedded together during ingestion
+INGEST_PAGE_BATCH_SIZE = 16
+
+# HNSW index parameters for the Chroma collection. Queries are answered by this
+# approximate nearest-neighbour graph rather than a full scan. Embeddings are
+# normalized, so l2 ranks the same as cosine. Only applied when the collection
+# is first created; existing collections keep the parameters they were built with.
+HNSW_COLLECTION_METADATA = {
+    "hnsw:space": "l2",
+    "hnsw:M": 16,                  # graph degree (memory vs. recall)
+    "hnsw:construction_ef": 200,   # build-time candidate list (index quality)
+    "hnsw:search_ef": 64,          # query-time candidate list (recall vs. latency)
+}
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of up to `size` items (itertools.batched for Python < 3.12)."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _chunk_fingerprint(text: str) -> bytes:
+    """64-bit fingerprint of chunk text, insensitive to case and whitespace."""
+    normalized = " ".join(text.lower().split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+
 
 class VectorStoreService:
     """
@@ -46,11 +90,15 @@ class VectorStoreService:
         logger.info("Initializing Vector Store Service...")
 
         # Initialize embeddings model
-        # This converts text into numerical vectors (embeddings)
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=settings.EMBEDDING_MODEL,
-            model_kwargs={'device': 'cpu'},  # Use 'cuda' if you have GPU
-            encode_kwargs={'normalize_embeddings': True}  # Normalize for cosine similarity
+        # This converts text into numerical vectors (embeddings).
+        # Query embeddings are served from the shared embedding cache.
+        self.embeddings = CachedEmbeddings(
+            HuggingFaceEmbeddings(
+                model_name=settings.EMBEDDING_MODEL,
+                model_kwargs={'device': 'cpu'},  # Use 'cuda' if you have GPU
+                encode_kwargs={'normalize_embeddings': True}  # Normalize for cosine similarity
+            ),
+            model_name=settings.EMBEDDING_MODEL
         )
 
         # Initialize chunking strategy
@@ -68,9 +116,22 @@ class VectorStoreService:
         self.vectorstore = Chroma(
             collection_name=settings.CHROMA_COLLECTION_NAME,
             embedding_function=self.embeddings,
-            persist_directory=settings.CHROMA_DB_PATH
+            persist_directory=settings.CHROMA_DB_PATH,
+            collection_metadata=HNSW_COLLECTION_METADATA
         )
 
+        # Short-lived cache for get_collection_stats (invalidated on writes)
+        self._stats_cache = None
+        self._stats_expiry = 0.0
+
+        # Inverted index of custom metadata: field -> values known to have chunks,
+        # plus values known to have none. Lets filtered searches that cannot match
+        # (e.g. a session with no uploads) return before the query is embedded and
+        # Chroma is searched. Misses are cleared when chunks with that field are
+        # added; both are cleared when chunks are deleted.
+        self._metadata_index: Dict[str, Set[Any]] = defaultdict(set)
+        self._metadata_misses: Dict[str, Set[Any]] = defaultdict(set)
+
         logger.info(f"Vector store initialized with collection: {settings.CHROMA_COLLECTION_NAME}")
         logger.info(f"Embeddings model: {settings.EMBEDDING_MODEL}")
         logger.info(f"Chunking strategy: {chunking_strategy}")
@@ -86,62 +147,106 @@ class VectorStoreService:
             metadata: Optional dictionary with additional metadata (e.g., session_id)
 
         Returns:
-            Dictionary with ingestion status and details
+            Dictionary with ingestion status and details. On error, chunks already
+            added for this document are removed again, so a retry starts clean.
         """
+        # Ids of chunks added so far, for rollback if a later batch fails
+        added_ids: List[str] = []
+
         try:
             logger.info(f"Ingesting document: {file_path}")
             if metadata:
                 logger.info(f"Adding metadata: {metadata}")
 
             # Load document based on type
-            if file_type.lower() == "pdf":
-                loader = PyPDFLoader(file_path)
-            elif file_type.lower() == "txt":
-                loader = TextLoader(file_path)
-            else:
+            loader_cls = _LOADERS.get(file_type.lower())
+            if loader_cls is None:
                 raise ValueError(f"Unsupported file type: {file_type}")
-
-            # Load the document
-            documents = loader.load()
-
-            if not documents:
+            loader = loader_cls(file_path)
+
+            # Stream pages from the loader in small batches so the whole document,
+            # its chunks and their embeddings are never held in memory at once
+            total_pages = 0
+            total_chunks = 0
+            dropped_chunks = 0
+            seen_fingerprints = set()
+
+            for page_batch in _batched(loader.lazy_load(), INGEST_PAGE_BATCH_SIZE):
+                total_pages += len(page_batch)
+
+                # Split into chunks using selected strategy
+                chunks = self.chunker(page_batch)
+
+                # Skip chunks already seen in this document so they are not embedded twice
+                if settings.DEDUP_CHUNKS:
+                    unique_chunks = []
+                    for chunk in chunks:
+                        fingerprint = _chunk_fingerprint(chunk.page_content)
+                        if fingerprint not in seen_fingerprints:
+                            seen_fingerprints.add(fingerprint)
+                            unique_chunks.append(chunk)
+                    dropped_chunks += len(chunks) - len(unique_chunks)
+                    chunks = unique_chunks
+
+                # Add custom metadata to each chunk if provided
+                if metadata:
+                    for chunk in chunks:
+                        # Merge custom metadata with existing metadata
+                        chunk.metadata.update(metadata)
+                        logger.debug("Added metadata to chunk: %s", chunk.metadata)
+
+                # Add to vector store
+                if chunks:
+                    added_ids.extend(self.vectorstore.add_documents(chunks))
+                    self._stats_cache = None
+                    self._forget_metadata_misses({key for chunk in chunks for key in chunk.metadata})
+                    total_chunks += len(chunks)
+
+            if not total_pages:
                 return {
                     "status": "error",
                     "message": "No content found in document"
                 }
 
-            # Split into chunks using selected strategy
-            chunks = self.chunker(documents)
-
-            # Add custom metadata to each chunk if provided
-            if metadata:
-                for chunk in chunks:
-                    # Merge custom metadata with existing metadata
-                    chunk.metadata.update(metadata)
-                    logger.debug(f"Added metadata to chunk: {chunk.metadata}")
-
-            logger.info(f"Split document into {len(chunks)} chunks using {self.chunking_strategy} strategy")
+            logger.info(f"Split document into {total_chunks} chunks using {self.chunking_strategy} strategy")
+            if dropped_chunks:
+                logger.info(f"Dropped {dropped_chunks} duplicate chunks before embedding")
 
-            # Add to vector store
-            self.vectorstore.add_documents(chunks)
+            if metadata and total_chunks:
+                self._index_metadata(metadata)
 
             logger.info(f"Successfully ingested document: {Path(file_path).name}")
 
             return {
                 "status": "success",
                 "message": f"Document ingested successfully",
-                "chunks": len(chunks),
+                "chunks": total_chunks,
                 "filename": Path(file_path).name
             }
 
         except Exception as e:
             error_msg = f"Error ingesting document: {str(e)}"
             logger.error(error_msg, exc_info=True)
+            self._rollback_chunks(added_ids)
             return {
                 "status": "error",
                 "message": error_msg
             }
 
+    def _rollback_chunks(self, ids: List[str]) -> None:
+        """Delete chunks added by a failed ingestion."""
+        if not ids:
+            return
+
+        try:
+            self.vectorstore.delete(ids=ids)
+            logger.info(f"Rolled back {len(ids)} chunks from failed ingestion")
+        except Exception as e:
+            logger.error(f"Failed to roll back {len(ids)} chunks: {str(e)}", exc_info=True)
+        finally:
+            self._stats_cache = None
+            self._clear_metadata_index()
+
     def search(self, query: str, k: int = None, use_reranking: bool = True, filter_metadata: dict = None) -> List[dict]:
         """
         Search the vector store for relevant documents with optional re-ranking and filtering.
@@ -153,45 +258,61 @@ class VectorStoreService:
             filter_metadata: Optional metadata filter (e.g., {"session_id": "abc123"})
 
         Returns:
-            List of relevant document chunks with metadata
+            List of relevant document chunks with metadata. 'similarity_score' is None
+            when re-ranking is off, since the plain search does not compute scores.
         """
+        if not query or not query.strip():
+            return []
+
         try:
             if k is None:
                 k = settings.TOP_K_RESULTS
 
-            # If re-ranking is enabled, retrieve more candidates first
-            retrieval_k = k * 5 if (use_reranking and self.reranker) else k
+            if k <= 0:
+                return []
+
+            if filter_metadata and not self._filter_has_matches(filter_metadata):
+                logger.info("No chunks match metadata filter: %s", filter_metadata)
+                return []
+
+            rerank = bool(use_reranking and self.reranker)
 
-            logger.info(f"Searching vector store for: {query[:50]}... (k={retrieval_k})")
+            # If re-ranking is enabled, retrieve more candidates first and keep their scores.
+            # Otherwise the plain search is enough and Chroma skips building score payloads.
+            if rerank:
+                search_fn = self.vectorstore.similarity_search_with_score
+                retrieval_k = k * 5
+            else:
+                search_fn = self.vectorstore.similarity_search
+                retrieval_k = k
+
+            logger.info("Searching vector store for: %.50s... (k=%d)", query, retrieval_k)
             if filter_metadata:
-                logger.info(f"Applying metadata filter: {filter_metadata}")
+                logger.info("Applying metadata filter: %s", filter_metadata)
 
             # Perform similarity search with optional filtering
             if filter_metadata:
-                results = self.vectorstore.similarity_search_with_score(
-                    query,
-                    k=retrieval_k,
-                    filter=filter_metadata
-                )
+                results = search_fn(query, k=retrieval_k, filter=filter_metadata)
             else:
-                results = self.vectorstore.similarity_search_with_score(query, k=retrieval_k)
+                results = search_fn(query, k=retrieval_k)
 
-            # Format results
+            # Format results (handles both Document and (Document, score) shapes)
             formatted_results = []
-            for doc, score in results:
+            for item in results:
+                doc, score = item if isinstance(item, tuple) else (item, None)
                 formatted_results.append({
                     "content": doc.page_content,
                     "metadata": doc.metadata,
-                    "similarity_score": float(score)
+                    "similarity_score": float(score) if score is not None else None
                 })
 
-            logger.info(f"Found {len(formatted_results)} relevant chunks from vector search")
+            logger.info("Found %d relevant chunks from vector search", len(formatted_results))
 
             # Apply re-ranking if enabled
-            if use_reranking and self.reranker and formatted_results:
+            if rerank and formatted_results:
                 logger.info("Applying re-ranking...")
                 formatted_results = self.reranker.rerank(query, formatted_results, top_k=k)
-                logger.info(f"Re-ranked to top {len(formatted_results)} results")
+                logger.info("Re-ranked to top %d results", len(formatted_results))
             else:
                 # Just return top k without re-ranking
                 formatted_results = formatted_results[:k]
@@ -202,6 +323,136 @@ class VectorStoreService:
             logger.error(f"Error searching vector store: {str(e)}", exc_info=True)
             return []
 
+    def batch_search(
+        self,
+        queries: List[str],
+        k: int = None,
+        use_reranking: bool = True,
+        filter_metadata: dict = None
+    ) -> List[List[dict]]:
+        """
+        Search for several queries at once.
+
+        All queries are embedded in one model call (cache misses only), then each
+        vector is searched through Chroma's public by-vector API and re-ranked per
+        query. Use this when an agent fans a question out into sub-questions.
+
+        Args:
+            queries: Search queries
+            k: Number of final results per query (default from settings)
+            use_reranking: Whether to use re-ranking (default True)
+            filter_metadata: Optional metadata filter applied to every query
+
+        Returns:
+            One result list per query, in the same order, shaped like search()
+        """
+        batch = [[] for _ in queries]
+        live = [i for i, query in enumerate(queries) if query and query.strip()]
+
+        if not live:
+            return batch
+
+        try:
+            if k is None:
+                k = settings.TOP_K_RESULTS
+
+            if k <= 0:
+                return batch
+
+            if filter_metadata and not self._filter_has_matches(filter_metadata):
+                logger.info("No chunks match metadata filter: %s", filter_metadata)
+                return batch
+
+            rerank = bool(use_reranking and self.reranker)
+
+            # Same retrieval choices as search(), on precomputed vectors
+            if rerank:
+                search_fn = self.vectorstore.similarity_search_by_vector_with_relevance_scores
+                retrieval_k = k * 5
+            else:
+                search_fn = self.vectorstore.similarity_search_by_vector
+                retrieval_k = k
+
+            logger.info("Batch searching vector store for %d queries (k=%d)", len(live), retrieval_k)
+
+            vectors = self.embeddings.embed_queries([queries[i] for i in live])
+
+            for vector, i in zip(vectors, live):
+                results = []
+                for item in search_fn(vector, k=retrieval_k, filter=filter_metadata or None):
+                    doc, score = item if isinstance(item, tuple) else (item, None)
+                    results.append({
+                        "content": doc.page_content,
+                        "metadata": doc.metadata,
+                        "similarity_score": float(score) if score is not None else None
+                    })
+
+                if rerank and results:
+                    results = self.reranker.rerank(queries[i], results, top_k=k)
+                else:
+                    results = results[:k]
+
+                batch[i] = results
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Batch search returned %d chunks for %d queries", sum(len(r) for r in batch), len(live))
+            return batch
+
+        except Exception as e:
+            logger.error(f"Error batch searching vector store: {str(e)}", exc_info=True)
+            return [[] for _ in queries]
+
+    def _index_metadata(self, metadata: dict) -> None:
+        """Record custom metadata values that now have chunks in the collection."""
+        for key, value in metadata.items():
+            if isinstance(value, (str, int, float, bool)):
+                self._metadata_index[key].add(value)
+
+    def _forget_metadata_misses(self, keys: Iterable[str]) -> None:
+        """Drop cached misses for fields that newly added chunks carry."""
+        for key in keys:
+            self._metadata_misses.pop(key, None)
+
+    def _clear_metadata_index(self) -> None:
+        """Forget all known hits and misses (after chunks were deleted)."""
+        self._metadata_index.clear()
+        self._metadata_misses.clear()
+
+    def _filter_has_matches(self, filter_metadata: dict) -> bool:
+        """
+        Check whether a metadata filter can match any chunk.
+
+        This is only an empty-result shortcut, not a candidate prefilter: Chroma
+        already applies the where filter during the vector query. It lets filters
+        that cannot match (e.g. a session with no uploads) return before the
+        query is embedded.
+
+        Values already known to match or to miss cost one hash lookup. Unknown
+        values are probed once against Chroma's metadata table (no vector search)
+        and the outcome remembered. Operator filters ($and, $in, ...) are not checked.
+
+        Returns:
+            False only if the filter is known to match nothing
+        """
+        for key, value in filter_metadata.items():
+            if key.startswith("$") or not isinstance(value, (str, int, float, bool)):
+                return True
+            if value in self._metadata_index[key]:
+                continue
+            if value in self._metadata_misses[key]:
+                return False
+
+            probe = self.vectorstore.get(where={key: value}, limit=1, include=[])
+            if not probe["ids"]:
+                misses = self._metadata_misses[key]
+                if len(misses) >= METADATA_MISS_CACHE_SIZE:
+                    misses.clear()
+                misses.add(value)
+                return False
+            self._metadata_index[key].add(value)
+
+        return True
+
     def get_retriever(self, k: int = None):
         """
         Get a LangChain retriever for the vector store.
@@ -224,6 +475,8 @@ class VectorStoreService:
         """Delete the entire collection (use with caution!)."""
         try:
             self.vectorstore.delete_collection()
+            self._stats_cache = None
+            self._clear_metadata_index()
             logger.info(f"Deleted collection: {settings.CHROMA_COLLECTION_NAME}")
 
             # Reinitialize
@@ -235,18 +488,30 @@ class VectorStoreService:
             return {"status": "error", "message": str(e)}
 
     def get_collection_stats(self) -> dict:
-        """Get statistics about the vector store collection."""
+        """
+        Get statistics about the vector store collection.
+
+        Results are cached for STATS_CACHE_TTL_SECONDS and invalidated whenever
+        documents are ingested or the collection is deleted.
+        """
+        now = time.monotonic()
+        if self._stats_cache is not None and now < self._stats_expiry:
+            return self._stats_cache
+
         try:
             # Get collection
             collection = self.vectorstore._collection
 
-            return {
+            stats = {
                 "collection_name": settings.CHROMA_COLLECTION_NAME,
                 "total_documents": collection.count(),
                 "embedding_model": settings.EMBEDDING_MODEL,
                 "chunk_size": settings.CHUNK_SIZE,
                 "chunk_overlap": settings.CHUNK_OVERLAP
             }
+            self._stats_cache = stats
+            self._stats_expiry = now + STATS_CACHE_TTL_SECONDS
+            return stats
         except Exception as e:
             logger.error(f"Error getting collection stats: {str(e)}")
             return {"error": str(e)}
@@ -0,0 +1,169 @@
+"""
+Caches for RAG search results.
+
+Repeated questions (chat retries, follow-ups) within a session return the
+previously formatted result instead of re-embedding the query and searching
+the vector store again (QueryCache). Paraphrased questions are matched by
+query embedding (a SemanticCache). Entries are dropped when documents are
+ingested.
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import hashlib
+import threading
+import time
+import logging
+
+from app.config import get_settings
+from app.services.semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# How long cached results stay valid (both caches)
+RESULT_TTL_SECONDS = 300
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+
+    Keys are built from (session_id, k, normalized query); values are the
+    formatted tool output.
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: float = RESULT_TTL_SECONDS):
+        """
+        Args:
+            max_size: Maximum number of cached results
+            ttl_seconds: How long a result stays valid
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.RLock()
+        # key -> (expiry, session_id, result), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Optional[str], str]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(session_id: Optional[str], k: int, query: str) -> str:
+        """Build the cache key for a search."""
+        raw = f"{session_id}|{k}|{query.strip().lower()}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached result.
+
+        Returns:
+            Cached result, or None on miss or expiry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, session_id: Optional[str], result: str) -> None:
+        """Cache a result, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, session_id, result)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: Optional[str] = None) -> None:
+        """
+        Drop results that a newly ingested document could change.
+
+        Args:
+            session_id: Session the document was uploaded in. Drops that session's
+                results plus unfiltered (no session) ones; None clears everything.
+        """
+        with self._lock:
+            if session_id is None:
+                self._entries.clear()
+            else:
+                stale = [
+                    key for key, (_, entry_session, _) in self._entries.items()
+                    if entry_session in (session_id, None)
+                ]
+                for key in stale:
+                    del self._entries[key]
+
+        logger.info(f"Invalidated RAG query cache (session: {session_id or 'all'})")
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+# Singleton instance
+_query_cache_instance = None
+
+
+def get_query_cache() -> QueryCache:
+    """
+    Get or create the RAG query cache instance (singleton).
+
+    Returns:
+        QueryCache instance
+    """
+    global _query_cache_instance
+
+    if _query_cache_instance is None:
+        _query_cache_instance = QueryCache()
+
+    return _query_cache_instance
+
+
+_semantic_cache_instance = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    Get or create the RAG semantic cache instance (singleton).
+
+    Entries are stored with context (session_id, k) and metadata
+    {"tool", "query", "session_id"}.
+
+    Returns:
+        SemanticCache instance
+    """
+    global _semantic_cache_instance
+
+    if _semantic_cache_instance is None:
+        _semantic_cache_instance = SemanticCache(
+            threshold=settings.RAG_SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=RESULT_TTL_SECONDS,
+            max_size=settings.RAG_SEMANTIC_CACHE_MAX_SIZE
+        )
+
+    return _semantic_cache_instance
+
+
+def invalidate_rag_caches(session_id: Optional[str] = None) -> None:
+    """
+    Drop cached RAG results that a newly ingested document could change.
+
+    Args:
+        session_id: Session the document was uploaded in. Drops that session's
+            results plus unfiltered (no session) ones; None clears everything.
+    """
+    get_query_cache().invalidate(session_id)
+    get_semantic_cache().invalidate(
+        lambda meta: meta.get("tool") == "rag_search"
+        and (session_id is None or meta.get("session_id") in (session_id, None))
+    )
@@ -4,18 +4,170 @@ Command Execution Tool for running safe system commands.
 SECURITY: This tool only allows safe, whitelisted commands.
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
-from typing import Optional, Type, ClassVar, Dict
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Type, ClassVar, Dict, Mapping, Any, Callable, List
+from types import MappingProxyType
+from pathlib import Path
 import subprocess
+import getpass
+import shutil
+import socket
+import asyncio
 import logging
 import platform
 import os
 
+from app.config import get_settings
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Platform details are static for the process lifetime, so look them up once
+_SYS = platform.system()
+_IS_WIN = _SYS == "Windows"
+_VERSION = platform.version()
+_PLATFORM = platform.platform()
+_MACHINE = platform.machine()
+_PYVER = platform.python_version()
+_PYCOMPILER = platform.python_compiler()
+_UNAME = " ".join(platform.uname())
+_WIN_RELEASE = platform.win32_ver()[0] if _IS_WIN else ""
+
+
+def _workspace() -> Path:
+    """Directory file commands run in (created on first use)."""
+    root = Path(settings.COMMAND_WORKSPACE_DIR).resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _resolve(path: str) -> Path:
+    """
+    Resolve a user-supplied path inside the workspace.
+
+    Raises:
+        PermissionError: If the path (after resolving '..' and symlinks) is outside it
+    """
+    root = _workspace()
+    resolved = (root / path).resolve()
+    if not resolved.is_relative_to(root):
+        raise PermissionError(f"Path '{path}' is outside the command workspace")
+    return resolved
+
+
+def _list_dir() -> str:
+    """List entries of the workspace (used where 'dir' is a shell builtin)."""
+    return "\n".join(sorted(os.listdir(_workspace())))
+
+
+def _make_dir(path: str) -> str:
+    _resolve(path).mkdir()
+    return f"Created directory: {path}"
+
+
+def _touch(path: str) -> str:
+    _resolve(path).touch()
+    return f"Created file: {path}"
+
+
+def _rename(old: str, new: str) -> str:
+    _resolve(old).rename(_resolve(new))
+    return f"Renamed {old} -> {new}"
+
+
+def _copy(source: str, dest: str) -> str:
+    shutil.copy2(_resolve(source), _resolve(dest))
+    return f"Copied {source} -> {dest}"
+
+
+def _move(source: str, dest: str) -> str:
+    shutil.move(_resolve(source), _resolve(dest))
+    return f"Moved {source} -> {dest}"
+
+
+# Whitelist of allowed commands (read-only, built once at import)
+# Each entry either runs an executable via "argv" (no shell) or a Python callable via "py".
+# "params" names the arguments parsed from the user's command, in order. File commands
+# run in the workspace directory and cannot reach paths outside it.
+_ALLOWED_COMMANDS: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    # Directory & Files (read)
+    "pwd": {"py": lambda: str(_workspace()), "desc": "Show current directory"},
+    "ls": {"py": _list_dir, "desc": "List files in current directory"} if _IS_WIN
+          else {"argv": ["ls"], "desc": "List files in current directory"},
+    "list_files": {"py": _list_dir, "desc": "List files with details"} if _IS_WIN
+                  else {"argv": ["ls", "-la"], "desc": "List files with details"},
+
+    # Directory & Files (write)
+    "mkdir": {"py": _make_dir, "params": ("path",), "desc": "Create a new directory (usage: mkdir foldername)"},
+    "touch": {"py": _touch, "params": ("path",), "desc": "Create a new empty file (usage: touch filename.txt)"},
+    "create_file": {"py": _touch, "params": ("path",), "desc": "Create a new empty file"},
+    "rename": {"py": _rename, "params": ("old", "new"), "desc": "Rename a file or directory (usage: rename oldname newname)"},
+    "copy": {"py": _copy, "params": ("source", "dest"), "desc": "Copy a file (usage: copy source.txt destination.txt)"},
+    "move": {"py": _move, "params": ("source", "dest"), "desc": "Move a file (usage: move file.txt newfolder/)"},
+
+    # System Info
+    "whoami": {"py": getpass.getuser, "desc": "Show current user"},
+    "hostname": {"py": socket.gethostname, "desc": "Show computer name"},
+    "os_info": {"py": lambda: _UNAME, "desc": "Show OS information"},
+    "disk_space": {"argv": ["wmic", "logicaldisk", "get", "size,freespace,caption"] if _IS_WIN else ["df", "-h"], "desc": "Show disk space"},
+
+    # Network Info (safe, read-only)
+    "ip_address": {"argv": ["ipconfig"] if _IS_WIN else ["ifconfig"], "desc": "Show network configuration"},
+
+    # Python
+    "python_version": {"argv": ["python", "--version"], "desc": "Show Python version"},
+    "pip_version": {"argv": ["pip", "--version"], "desc": "Show pip version"},
+})
+
+
+def _make_arg_parser(param_names: tuple) -> Callable[[List[str]], Optional[List[str]]]:
+    """
+    Build a parser specialized for a command's parameter list.
+
+    The returned function takes the whitespace-split user command and returns the
+    positional arguments, or None if too few were given. The last parameter takes
+    the rest of the command (allows spaces in names).
+    """
+    count = len(param_names)
+
+    if count == 0:
+        # Extra words are an error rather than silently ignored ("ls /etc")
+        return lambda parts: [] if len(parts) == 1 else None
+
+    def parse(parts: List[str]) -> Optional[List[str]]:
+        if len(parts) <= count:
+            return None
+        return parts[1:count] + [" ".join(parts[count:])]
+
+    return parse
+
+
+# Per-command argument parsers, specialized once at import
+_ARG_PARSERS: Mapping[str, Callable[[List[str]], Optional[List[str]]]] = MappingProxyType({
+    key: _make_arg_parser(info.get("params", ())) for key, info in _ALLOWED_COMMANDS.items()
+})
+
+# Common natural-language variations mapped to whitelisted command keys
+_COMMAND_MAP: Mapping[str, str] = MappingProxyType({
+    "where am i": "pwd",
+    "current directory": "pwd",
+    "show files": "ls",
+    "list directory": "ls",
+    "my username": "whoami",
+    "computer name": "hostname",
+    "system info": "os_info",
+    "check disk space": "disk_space",
+    "my ip": "ip_address",
+})
+
+# Help text listing available commands, shown when a command is rejected
+_AVAILABLE_DESC = "\n".join(f"- {k}: {v['desc']}" for k, v in _ALLOWED_COMMANDS.items())
 
 
 class CommandExecutionInput(BaseModel):
     """Input schema for command execution tool."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     command: str = Field(description="The system command to execute (must be from allowed list)")
 
 
@@ -39,6 +191,7 @@ class CommandExecutionTool(BaseTool):
     description: str = (
         "Execute LOCAL system commands for file/directory operations on THIS computer. "
         "Can: list files, create directories, create/rename/copy/move files, check disk space. "
+        "File commands work inside the assistant's workspace folder only. "
         "ONLY use for local file system operations. NOT for time, weather, or web information. "
         "Examples: 'create folder test', 'rename file.txt newfile.txt', 'list files'. "
         "Only safe, whitelisted commands are allowed."
@@ -46,33 +199,7 @@ class CommandExecutionTool(BaseTool):
     args_schema: Type[BaseModel] = CommandExecutionInput
 
     # Whitelist of allowed commands (ClassVar to avoid Pydantic field error)
-    ALLOWED_COMMANDS: ClassVar[Dict[str, Dict[str, str]]] = {
-        # Directory & Files (read)
-        "pwd": {"cmd": "cd" if platform.system() == "Windows" else "pwd", "desc": "Show current directory"},
-        "ls": {"cmd": "dir" if platform.system() == "Windows" else "ls", "desc": "List files in current directory"},
-        "list_files": {"cmd": "dir" if platform.system() == "Windows" else "ls -la", "desc": "List files with details"},
-
-        # Directory & Files (write)
-        "mkdir": {"cmd": "mkdir {path}", "desc": "Create a new directory (usage: mkdir foldername)"},
-        "touch": {"cmd": "type nul > {path}" if platform.system() == "Windows" else "touch {path}", "desc": "Create a new empty file (usage: touch filename.txt)"},
-        "create_file": {"cmd": "type nul > {path}" if platform.system() == "Windows" else "touch {path}", "desc": "Create a new empty file"},
-        "rename": {"cmd": "ren {old} {new}" if platform.system() == "Windows" else "mv {old} {new}", "desc": "Rename a file or directory (usage: rename oldname newname)"},
-        "copy": {"cmd": "copy {source} {dest}" if platform.system() == "Windows" else "cp {source} {dest}", "desc": "Copy a file (usage: copy source.txt destination.txt)"},
-        "move": {"cmd": "move {source} {dest}" if platform.system() == "Windows" else "mv {source} {dest}", "desc": "Move a file (usage: move file.txt newfolder/)"},
-
-        # System Info
-        "whoami": {"cmd": "whoami", "desc": "Show current user"},
-        "hostname": {"cmd": "hostname", "desc": "Show computer name"},
-        "os_info": {"cmd": "ver" if platform.system() == "Windows" else "uname -a", "desc": "Show OS information"},
-        "disk_space": {"cmd": "wmic logicaldisk get size,freespace,caption" if platform.system() == "Windows" else "df -h", "desc": "Show disk space"},
-
-        # Network Info (safe, read-only)
-        "ip_address": {"cmd": "ipconfig" if platform.system() == "Windows" else "ifconfig", "desc": "Show network configuration"},
-
-        # Python
-        "python_version": {"cmd": "python --version", "desc": "Show Python version"},
-        "pip_version": {"cmd": "pip --version", "desc": "Show pip version"},
-    }
+    ALLOWED_COMMANDS: ClassVar[Mapping[str, Dict[str, Any]]] = _ALLOWED_COMMANDS
 
     def _run(self, command: str) -> str:
         """
@@ -89,68 +216,53 @@ class CommandExecutionTool(BaseTool):
 
             # Parse command (handle variations)
             command_key = command.lower().strip()
+            parts = [command_key]
 
-            # Map common variations
-            command_map = {
-                "where am i": "pwd",
-                "current directory": "pwd",
-                "show files": "ls",
-                "list directory": "ls",
-                "my username": "whoami",
-                "computer name": "hostname",
-                "system info": "os_info",
-                "check disk space": "disk_space",
-                "my ip": "ip_address",
-            }
-
-            # Check for mapped variations
-            if command_key in command_map:
-                command_key = command_map[command_key]
+            # Map common variations (e.g. "where am i" -> "pwd")
+            if command_key not in self.ALLOWED_COMMANDS:
+                mapped = _COMMAND_MAP.get(command_key)
+                if mapped:
+                    command_key = mapped
+                elif command_key:
+                    # Commands with parameters, e.g. "mkdir test" -> "mkdir"
+                    parts = command.split()
+                    command_key = parts[0].lower()
 
             # Check if command is allowed
             if command_key not in self.ALLOWED_COMMANDS:
-                available = "\n".join([f"- {k}: {v['desc']}" for k, v in self.ALLOWED_COMMANDS.items()])
                 return (
                     f"❌ Command '{command}' is not allowed for security reasons.\n\n"
-                    f"Available commands:\n{available}\n\n"
+                    f"Available commands:\n{_AVAILABLE_DESC}\n\n"
                     f"Example: 'list files', 'create folder test', 'rename old.txt new.txt'"
                 )
 
             # Get the actual command to execute
             cmd_info = self.ALLOWED_COMMANDS[command_key]
-            actual_cmd = cmd_info["cmd"]
-
-            # Parse parameters if command has placeholders
-            if "{" in actual_cmd:
-                # Extract parameters from original command
-                # Example: "mkdir test" -> path="test"
-                # Example: "rename old.txt new.txt" -> old="old.txt", new="new.txt"
-                parts = command.split()
-                if len(parts) < 2:
-                    return f"❌ Command '{command_key}' requires parameters. {cmd_info['desc']}"
-
-                if "{path}" in actual_cmd:
-                    path = " ".join(parts[1:])
-                    actual_cmd = actual_cmd.replace("{path}", path)
-                elif "{old}" in actual_cmd and "{new}" in actual_cmd:
-                    if len(parts) < 3:
-                        return f"❌ Command '{command_key}' requires two parameters. {cmd_info['desc']}"
-                    old = parts[1]
-                    new = " ".join(parts[2:])
-                    actual_cmd = actual_cmd.replace("{old}", old).replace("{new}", new)
-                elif "{source}" in actual_cmd and "{dest}" in actual_cmd:
-                    if len(parts) < 3:
-                        return f"❌ Command '{command_key}' requires source and destination. {cmd_info['desc']}"
-                    source = parts[1]
-                    dest = " ".join(parts[2:])
-                    actual_cmd = actual_cmd.replace("{source}", source).replace("{dest}", dest)
-
-            logger.info(f"Executing whitelisted command: {actual_cmd}")
-
-            # Execute command
+
+            # Parse parameters with the command's specialized parser
+            # Example: "mkdir test" -> path="test"
+            # Example: "rename old.txt new.txt" -> old="old.txt", new="new.txt"
+            args = _ARG_PARSERS[command_key](parts)
+            if args is None:
+                param_names = cmd_info.get("params", ())
+                if not param_names:
+                    return f"❌ Command '{command_key}' takes no parameters. {cmd_info['desc']}"
+                return f"❌ Command '{command_key}' requires {len(param_names)} parameter(s): {', '.join(param_names)}. {cmd_info['desc']}"
+
+            # Pure-Python commands run in-process, no subprocess needed
+            if "py" in cmd_info:
+                logger.info(f"Executing whitelisted command: {command_key} {args}")
+                output = str(cmd_info["py"](*args) or "").strip()
+                return f"✓ Command executed successfully:\n\n{output}" if output else "✓ Command completed (no output)"
+
+            argv = cmd_info["argv"] + args
+            logger.info(f"Executing whitelisted command: {argv}")
+
+            # Execute command directly (no intermediate shell)
             result = subprocess.run(
-                actual_cmd,
-                shell=True,
+                argv,
+                cwd=_workspace(),
+                shell=False,
                 capture_output=True,
                 text=True,
                 timeout=10  # 10 second timeout
@@ -170,14 +282,18 @@ class CommandExecutionTool(BaseTool):
             logger.error(error_msg)
             return f"❌ {error_msg}"
 
+        except PermissionError as e:
+            logger.warning(f"Rejected command '{command}': {str(e)}")
+            return f"❌ {str(e)}"
+
         except Exception as e:
             error_msg = f"Error executing command: {str(e)}"
             logger.error(error_msg, exc_info=True)
             return f"❌ {error_msg}"
 
     async def _arun(self, command: str) -> str:
-        """Async version (falls back to sync)."""
-        return self._run(command)
+        """Async version (runs in a worker thread so the event loop is not blocked)."""
+        return await asyncio.to_thread(self._run, command)
 
 
 class SystemInfoTool(BaseTool):
@@ -211,15 +327,14 @@ class SystemInfoTool(BaseTool):
             info = {}
 
             if "os" in command or "platform" in command or "system" in command:
-                info["Operating System"] = platform.system()
+                info["Operating System"] = _SYS
 
                 # Get proper Windows version (Windows 10, 11, etc.)
-                if platform.system() == "Windows":
+                if _IS_WIN:
                     try:
                         # Windows 11 = build 22000+, Windows 10 = build 19041+
-                        win_ver = platform.win32_ver()
-                        release = win_ver[0]  # e.g., "10"
-                        build = int(platform.version().split('.')[-1])
+                        release = _WIN_RELEASE  # e.g., "10"
+                        build = int(_VERSION.split('.')[-1])
 
                         if release == "10" and build >= 22000:
                             info["OS Version"] = "Windows 11"
@@ -228,18 +343,18 @@ class SystemInfoTool(BaseTool):
                         else:
                             info["OS Version"] = f"Windows {release}"
 
-                        info["Build"] = platform.version()
+                        info["Build"] = _VERSION
                     except:
-                        info["OS Version"] = platform.version()
+                        info["OS Version"] = _VERSION
                 else:
-                    info["OS Version"] = platform.version()
+                    info["OS Version"] = _VERSION
 
-                info["Platform"] = platform.platform()
-                info["Architecture"] = platform.machine()
+                info["Platform"] = _PLATFORM
+                info["Architecture"] = _MACHINE
 
             if "python" in command:
-                info["Python Version"] = platform.python_version()
-                info["Python Compiler"] = platform.python_compiler()
+                info["Python Version"] = _PYVER
+                info["Python Compiler"] = _PYCOMPILER
 
             if "directory" in command or "folder" in command or "location" in command:
                 info["Current Directory"] = os.getcwd()
@@ -251,9 +366,9 @@ class SystemInfoTool(BaseTool):
             if not info:
                 # Default: return all
                 info = {
-                    "Operating System": platform.system(),
-                    "OS Version": platform.version(),
-                    "Python Version": platform.python_version(),
+                    "Operating System": _SYS,
+                    "OS Version": _VERSION,
+                    "Python Version": _PYVER,
                     "Current Directory": os.getcwd(),
                 }
 
@@ -270,8 +385,8 @@ class SystemInfoTool(BaseTool):
             return error_msg
 
     async def _arun(self, command: str) -> str:
-        """Async version (falls back to sync)."""
-        return self._run(command)
+        """Async version (runs in a worker thread so the event loop is not blocked)."""
+        return await asyncio.to_thread(self._run, command)
 
 
 def get_command_execution_tool() -> CommandExecutionTool:
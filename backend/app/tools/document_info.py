@@ -2,10 +2,11 @@
 Document Info Tool - Check available documents in the knowledge base.
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Type
+import asyncio
 import logging
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 
 from app.database import SessionLocal
 from app.models import Document
@@ -13,9 +14,14 @@ from app.services.vector_store import get_vector_store
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of documents listed in the tool output
+MAX_LISTED_DOCUMENTS = 50
+
 
 class DocumentInfoInput(BaseModel):
     """Input schema for document info tool."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     query: str = Field(
         default="list",
         description="Action to perform: 'list' to see all documents, or specific filename to get details"
@@ -61,19 +67,32 @@ class DocumentInfoTool(BaseTool):
                 stats = vector_store.get_collection_stats()
                 total_chunks = stats.get('total_documents', 0)
 
-                # Get all documents from database
-                documents = db.query(Document).order_by(desc(Document.created_at)).all()
+                # Count documents per status in a single aggregate query
+                status_counts = dict(
+                    db.query(Document.status, func.count(Document.id))
+                    .group_by(Document.status)
+                    .all()
+                )
+                total_documents = sum(status_counts.values())
 
-                if not documents:
+                if not total_documents:
                     return (
                         "No documents have been uploaded to the knowledge base yet. "
                         "You can upload PDF or TXT files to search through them later."
                     )
 
+                # Fetch only the columns needed for the most recent documents
+                documents = (
+                    db.query(Document.filename, Document.file_type, Document.status, Document.created_at)
+                    .order_by(desc(Document.created_at))
+                    .limit(MAX_LISTED_DOCUMENTS)
+                    .all()
+                )
+
                 # Format document list
                 result_lines = [
                     f"Knowledge Base Status:",
-                    f"- Total documents: {len(documents)}",
+                    f"- Total documents: {total_documents}",
                     f"- Total searchable chunks: {total_chunks}",
                     f"\nUploaded Documents:\n"
                 ]
@@ -87,13 +106,16 @@ class DocumentInfoTool(BaseTool):
                         f"   Uploaded: {doc.created_at.strftime('%Y-%m-%d %H:%M')}\n"
                     )
 
+                if total_documents > len(documents):
+                    result_lines.append(f"... and {total_documents - len(documents)} older document(s) not shown.")
+
                 result = "\n".join(result_lines)
 
                 # Add helpful message
-                if any(doc.status == "processed" for doc in documents):
+                if status_counts.get("processed", 0) > 0:
                     result += "\nYou can ask questions about these documents and I'll search through them for answers."
 
-                logger.info(f"Found {len(documents)} documents in knowledge base")
+                logger.info(f"Found {total_documents} documents in knowledge base")
                 return result
 
             finally:
@@ -105,8 +127,8 @@ class DocumentInfoTool(BaseTool):
             return error_msg
 
     async def _arun(self, query: str = "list") -> str:
-        """Async version (falls back to sync)."""
-        return self._run(query)
+        """Async version (runs in a worker thread so the event loop is not blocked)."""
+        return await asyncio.to_thread(self._run, query)
 
 
 def get_document_info_tool() -> DocumentInfoTool:
@@ -5,20 +5,228 @@ Uses Gemini 2.5 Flash model with Google Search grounding enabled
 for real-time web search capabilities.
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
-from typing import Type, Any
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from typing import Type, Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import functools
 import logging
+import re
+import threading
+import time
+import weakref
+import httpx
 from google import genai
 from google.genai import types
 
-from app.config import get_settings
+from app.config import get_settings, get_session_context
+from app.services.embedding_cache import get_embedding_cache
+from app.services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Queries about live data are never answered from the cache
+_TIME_SENSITIVE_PATTERN = re.compile(r"\b(now|today|tonight|current|currently|latest|live)\b", re.IGNORECASE)
+
+# Follow-ups that lean on earlier turns ("change it to red", "what about that one") are
+# only answered from entries cached in the same session
+_CONTEXT_DEPENDENT_PATTERN = re.compile(
+    r"\b(it|its|that|this|these|those|them|they|there|same|above|previous)\b", re.IGNORECASE
+)
+
+# Shared across tool instances so paraphrased queries reuse earlier answers
+_search_cache = SemanticCache(
+    threshold=settings.WEB_SEARCH_CACHE_THRESHOLD,
+    ttl_seconds=settings.WEB_SEARCH_CACHE_TTL_SECONDS,
+    max_size=settings.WEB_SEARCH_CACHE_MAX_SIZE
+)
+
+# Keep-alive pool for the Gemini HTTP clients; HTTP/2 multiplexes concurrent requests
+# over the pooled connections instead of opening (and TLS-handshaking) new ones
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60)
+
+
+class _KeyLoad:
+    """
+    In-flight request tracking and concurrency limit for one search API key.
+
+    Counters are shared by sync callers (worker threads) and the event loop, so
+    they are updated under a lock. The concurrency limit is an asyncio.Semaphore,
+    which binds to the loop that first waits on it, so each event loop gets its
+    own (the limit applies per loop).
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.served = 0
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def load(self) -> Tuple[int, int]:
+        """Current (in_flight, served) counts, for picking the least-loaded key."""
+        with self._lock:
+            return self.in_flight, self.served
+
+    @contextmanager
+    def track(self):
+        """Count a request against this key while it runs."""
+        with self._lock:
+            self.in_flight += 1
+            self.served += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Count a request and wait for a free concurrency slot on this key."""
+        with self.track():
+            async with self._semaphore():
+                yield
+
+
+# Per-key load, shared across all tool instances so limits hold process-wide
+_KEY_LOADS: Dict[str, _KeyLoad] = {}
+
+
+def _key_load(api_key: str) -> _KeyLoad:
+    if api_key not in _KEY_LOADS:
+        _KEY_LOADS[api_key] = _KeyLoad(settings.GEMINI_SEARCH_MAX_CONCURRENCY)
+    return _KEY_LOADS[api_key]
+
+
+# Gemini clients by API key, shared across tool instances so their pooled (and
+# already TLS-handshaken) connections survive the tool being re-created
+_GEMINI_CLIENTS: Dict[str, genai.Client] = {}
+
+
+def _gemini_client(api_key: str) -> genai.Client:
+    if api_key not in _GEMINI_CLIENTS:
+        # Passing a transport also keeps the async side on httpx rather than aiohttp
+        _GEMINI_CLIENTS[api_key] = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                client_args={"http2": True, "limits": _HTTP_LIMITS},
+                async_client_args={"transport": httpx.AsyncHTTPTransport(http2=True, limits=_HTTP_LIMITS)}
+            )
+        )
+    return _GEMINI_CLIENTS[api_key]
+
+
+# Batch Mode: queries submitted within this window (or up to this many) share one job
+BATCH_WINDOW_SECONDS = 0.25
+BATCH_MAX_SIZE = 32
+BATCH_POLL_SECONDS = 10.0
+BATCH_TIMEOUT_SECONDS = 24 * 3600  # batch_run() called directly (offline workloads)
+BATCH_INTERACTIVE_TIMEOUT_SECONDS = 120  # batches collected from agent searches by BatchProcessor
+
+# Gemini batch job states after which polling stops
+_BATCH_DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+})
+
+
+class BatchProcessor:
+    """
+    Collects queries submitted close together and runs them as one batch.
+
+    Each submit() waits until the batch is flushed, either when the window
+    elapses or when max_batch_size queries are pending, and then resolves
+    with its own result. Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[str]], List[str]],
+        window_seconds: float = BATCH_WINDOW_SECONDS,
+        max_batch_size: int = BATCH_MAX_SIZE
+    ):
+        """
+        Args:
+            run_batch: Blocking function mapping a list of queries to results (same order)
+            window_seconds: How long to wait for more queries before flushing
+            max_batch_size: Flush immediately once this many queries are pending
+        """
+        self.run_batch = run_batch
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(self, query: str) -> str:
+        """Queue a query and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        queries = [query for query, _ in batch]
+        logger.info(f"[GEMINI BATCH] Submitting {len(queries)} queries as one batch")
+
+        try:
+            results = await asyncio.to_thread(self.run_batch, queries)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+        # A short result list must not leave callers waiting forever
+        if len(results) < len(batch):
+            error = RuntimeError(f"batch returned {len(results)} results for {len(batch)} queries")
+            for _, future in batch[len(results):]:
+                if not future.done():
+                    future.set_exception(error)
+
 
 class WebSearchInput(BaseModel):
     """Input schema for web search tool."""
+    model_config = ConfigDict(frozen=True)
+
     query: str = Field(description="The search query or question requiring current/real-time information from the web")
 
 
@@ -57,31 +265,214 @@ class GeminiWebSearchTool(BaseTool):
         "\n**DO NOT use for:** uploaded documents (use rag_search), local files, or saved notes."
     )
     args_schema: Type[BaseModel] = WebSearchInput
-    client: Any = Field(default=None, exclude=True)  # Pydantic field for Gemini client
-    model: str = Field(default="gemini-2.5-flash", exclude=True)  # Model name
+    use_batch: bool = Field(default=False, exclude=True)  # Route _arun through Gemini Batch Mode (not real-time)
+    streaming: bool = Field(default=False, exclude=True)  # Stream answer chunks to callbacks via on_text
+
+    # Runtime state, set in __init__ (private attributes skip validation)
+    _client: Any = PrivateAttr(default=None)  # Gemini client for the first key (embeddings, batches)
+    _clients: List[Any] = PrivateAttr(default_factory=list)  # One client per search API key
+    _key_loads: List[_KeyLoad] = PrivateAttr(default_factory=list)  # Load tracking for each entry in _clients
+    _batch_processor: Optional[BatchProcessor] = PrivateAttr(default=None)
+    _model: str = PrivateAttr(default="gemini-2.5-flash")  # Model name
 
-    class Config:
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     def __init__(self, **kwargs):
         """Initialize the Gemini client with Google Search grounding."""
         super().__init__(**kwargs)
 
-        # Use separate API key if available, otherwise fall back to main key
-        api_key = settings.GEMINI_SEARCH_API_KEY or settings.GEMINI_API_KEY
+        # Use the search key pool if configured, else the separate search key, else the main key
+        api_keys = settings.GEMINI_SEARCH_API_KEYS or [settings.GEMINI_SEARCH_API_KEY or settings.GEMINI_API_KEY]
+
+        # Gemini clients (new SDK) are shared per key; only newly created ones need warming up
+        new_keys = [api_key for api_key in api_keys if api_key not in _GEMINI_CLIENTS]
+        self._clients = [_gemini_client(api_key) for api_key in api_keys]
+        self._key_loads = [_key_load(api_key) for api_key in api_keys]
+        self._client = self._clients[0]
 
-        # Initialize Gemini client with the new SDK
-        self.client = genai.Client(api_key=api_key)
-        self.model = "gemini-2.5-flash"  # Model name as string
+        # Open the pooled connection in the background so the first search skips the TLS handshake
+        if new_keys:
+            new_clients = [_GEMINI_CLIENTS[api_key] for api_key in new_keys]
+            threading.Thread(target=self._warm_up, args=(new_clients,), daemon=True).start()
+
+        if self.use_batch:
+            self._batch_processor = BatchProcessor(
+                functools.partial(self.batch_run, timeout_seconds=BATCH_INTERACTIVE_TIMEOUT_SECONDS)
+            )
 
-        logger.info("Initialized Gemini Web Search tool with Google Search grounding enabled")
+        logger.info(
+            f"Initialized Gemini Web Search tool with Google Search grounding enabled "
+            f"({len(self._clients)} API key(s))"
+        )
 
-    def _run(self, query: str) -> str:
+    def _warm_up(self, clients: List[Any]):
+        """Prime the sync connection pools with a cheap model metadata request."""
+        for client in clients:
+            try:
+                client.models.get(model=self._model)
+                logger.info("[GEMINI GROUNDED SEARCH] Connection pool warmed up")
+            except Exception as e:
+                logger.warning(f"[GEMINI GROUNDED SEARCH] Warm-up request failed: {e}")
+
+    def _pick_client(self) -> Tuple[Any, _KeyLoad]:
+        """
+        Pick the key with the fewest in-flight requests.
+
+        Ties go to the key that has served the fewest requests, so idle
+        traffic is spread round-robin.
+        """
+        idx = min(
+            range(len(self._clients)),
+            key=lambda i: self._key_loads[i].load()
+        )
+        return self._clients[idx], self._key_loads[idx]
+
+    def _build_config(self) -> types.GenerateContentConfig:
+        """Build the generation config with Google Search grounding enabled."""
+        return types.GenerateContentConfig(
+            temperature=0.1,  # Low temperature for factual accuracy
+            tools=[types.Tool(google_search=types.GoogleSearch())]  # Enable Google Search grounding
+        )
+
+    def _cache_vector(self, query: str) -> Optional[List[float]]:
+        """
+        Embed the query for a semantic cache lookup.
+
+        Returns:
+            Query embedding, or None if the query should bypass the cache
+        """
+        if not settings.WEB_SEARCH_CACHE_ENABLED or _TIME_SENSITIVE_PATTERN.search(query):
+            return None
+
+        def embed() -> List[float]:
+            response = self._client.models.embed_content(
+                model=settings.WEB_SEARCH_CACHE_EMBEDDING_MODEL,
+                contents=query
+            )
+            return response.embeddings[0].values
+
+        try:
+            return get_embedding_cache().get_or_compute(
+                settings.WEB_SEARCH_CACHE_EMBEDDING_MODEL, query, embed
+            )
+        except Exception as e:
+            logger.warning(f"[GEMINI GROUNDED SEARCH] Cache embedding failed, bypassing cache: {e}")
+            return None
+
+    def _cache_context(self, query: str) -> Optional[str]:
+        """Cache context for a query: the session ID for follow-ups, None for standalone queries."""
+        if _CONTEXT_DEPENDENT_PATTERN.search(query):
+            return get_session_context()
+        return None
+
+    def _cache_metadata(self, query: str, context: Optional[str]) -> dict:
+        """Tags stored with a cached answer, used by invalidate() predicates."""
+        return {"tool": self.name, "query": query, "context": context}
+
+    def _parse_response(self, response) -> str:
+        """
+        Extract the answer text and log grounding metadata.
+
+        Args:
+            response: GenerateContentResponse from Gemini
+
+        Returns:
+            Answer text
+        """
+        result = response.text.strip()
+        self._log_grounding(result, response)
+        return result
+
+    def _log_grounding(self, result: str, response) -> None:
+        """
+        Log the answer and whether Google Search grounding was used.
+
+        Args:
+            result: Answer text
+            response: GenerateContentResponse (for streams, the final chunk)
+        """
+        logger.debug("[GEMINI GROUNDED SEARCH] Result: %.200s...", result)
+
+        # CRITICAL: Check if grounding actually happened (in candidates[0].grounding_metadata)
+        metadata = None
+        if response.candidates:
+            metadata = response.candidates[0].grounding_metadata
+
+        if not metadata:
+            logger.warning("[GEMINI GROUNDED SEARCH] ⚠️ NO GROUNDING METADATA - Model may have used internal knowledge instead of web search!")
+            return
+
+        sources = metadata.grounding_chunks or []
+        logger.info("[GEMINI GROUNDED SEARCH] ✅ GROUNDING ACTIVE - Found %d web sources", len(sources))
+
+        # Queries and source details are only traversed when DEBUG logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            if metadata.web_search_queries:
+                logger.debug("[GEMINI GROUNDED SEARCH] Search queries: %s", metadata.web_search_queries)
+
+            # Log first few sources
+            for i, chunk in enumerate(sources[:3]):
+                if chunk.web:
+                    logger.debug("[GEMINI GROUNDED SEARCH]   Source %d: %s - %s", i + 1, chunk.web.title, chunk.web.uri)
+
+    def _run_stream(self, query: str) -> Iterator[str]:
+        """
+        Stream the grounded answer as chunks arrive.
+
+        Grounding metadata is only complete on the final chunk, so it is
+        logged once the stream ends.
+
+        Args:
+            query: Search query or question
+
+        Yields:
+            Answer text chunks
+        """
+        parts = []
+        last_chunk = None
+        client, load = self._pick_client()
+
+        with load.track():
+            for chunk in client.models.generate_content_stream(
+                model=self._model,
+                contents=query,
+                config=self._build_config()
+            ):
+                last_chunk = chunk
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+
+        if last_chunk is not None:
+            self._log_grounding("".join(parts).strip(), last_chunk)
+
+    async def _arun_stream(self, query: str) -> AsyncIterator[str]:
+        """Async version of _run_stream using the non-blocking Gemini client."""
+        parts = []
+        last_chunk = None
+        client, load = self._pick_client()
+
+        async with load.acquire():
+            async for chunk in await client.aio.models.generate_content_stream(
+                model=self._model,
+                contents=query,
+                config=self._build_config()
+            ):
+                last_chunk = chunk
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+
+        if last_chunk is not None:
+            self._log_grounding("".join(parts).strip(), last_chunk)
+
+    def _run(self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         """
         Execute web search using Gemini with Google Search grounding.
 
         Args:
             query: Search query or question
+            run_manager: Receives answer chunks via on_text when streaming is enabled
 
         Returns:
             Response with current/real-time information from the web
@@ -89,44 +480,89 @@ class GeminiWebSearchTool(BaseTool):
         try:
             logger.info(f"[GEMINI GROUNDED SEARCH] Query: {query}")
 
-            # Generate response with Google Search grounding using official SDK format
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=query,  # Use query directly as per official docs
-                config=types.GenerateContentConfig(
-                    temperature=0.1,  # Low temperature for factual accuracy
-                    tools=[types.Tool(google_search=types.GoogleSearch())]  # Enable Google Search grounding
-                )
-            )
+            # Reuse a cached answer for the same or a paraphrased query
+            vector = self._cache_vector(query)
+            context = self._cache_context(query)
+            if vector is not None:
+                cached = _search_cache.lookup(vector, context)
+                if cached is not None:
+                    logger.info("[GEMINI GROUNDED SEARCH] Semantic cache hit")
+                    return cached
+
+            if self.streaming:
+                parts = []
+                for text in self._run_stream(query):
+                    parts.append(text)
+                    if run_manager:
+                        run_manager.on_text(text)
+                result = "".join(parts).strip()
+            else:
+                client, load = self._pick_client()
+
+                # Generate response with Google Search grounding using official SDK format
+                with load.track():
+                    response = client.models.generate_content(
+                        model=self._model,
+                        contents=query,  # Use query directly as per official docs
+                        config=self._build_config()
+                    )
+                result = self._parse_response(response)
+
+            if vector is not None:
+                _search_cache.store(vector, result, context, self._cache_metadata(query, context))
+
+            return result
+
+        except Exception as e:
+            error_msg = f"Error performing grounded web search: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return f"I encountered an error while searching the web: {str(e)}"
+
+    async def _arun(self, query: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        """
+        Async version of _run using the non-blocking Gemini client.
+
+        Args:
+            query: Search query or question
+            run_manager: Receives answer chunks via on_text when streaming is enabled
 
-            result = response.text.strip()
-
-            logger.info(f"[GEMINI GROUNDED SEARCH] Result: {result[:200]}...")
-
-            # CRITICAL: Check if grounding actually happened (in candidates[0].grounding_metadata)
-            metadata = None
-            if hasattr(response, 'candidates') and response.candidates and len(response.candidates) > 0:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
-                    metadata = candidate.grounding_metadata
-
-            if metadata:
-                # Log web search queries executed
-                if hasattr(metadata, 'web_search_queries') and metadata.web_search_queries:
-                    logger.info(f"[GEMINI GROUNDED SEARCH] ✅ GROUNDING ACTIVE - Search queries: {metadata.web_search_queries}")
-
-                # Log grounding chunks (sources)
-                if hasattr(metadata, 'grounding_chunks') and metadata.grounding_chunks:
-                    source_count = len(metadata.grounding_chunks)
-                    logger.info(f"[GEMINI GROUNDED SEARCH] ✅ GROUNDING ACTIVE - Found {source_count} web sources")
-                    # Log first few sources
-                    for i, chunk in enumerate(metadata.grounding_chunks[:3]):
-                        if hasattr(chunk, 'web') and chunk.web:
-                            uri = chunk.web.uri if hasattr(chunk.web, 'uri') else 'unknown'
-                            title = chunk.web.title if hasattr(chunk.web, 'title') else 'N/A'
-                            logger.info(f"[GEMINI GROUNDED SEARCH]   Source {i+1}: {title} - {uri}")
+        Returns:
+            Response with current/real-time information from the web
+        """
+        try:
+            logger.info(f"[GEMINI GROUNDED SEARCH] Query (async): {query}")
+
+            if self.use_batch:
+                return await self._batch_processor.submit(query)
+
+            vector = await asyncio.to_thread(self._cache_vector, query)
+            context = self._cache_context(query)
+            if vector is not None:
+                cached = _search_cache.lookup(vector, context)
+                if cached is not None:
+                    logger.info("[GEMINI GROUNDED SEARCH] Semantic cache hit")
+                    return cached
+
+            if self.streaming:
+                parts = []
+                async for text in self._arun_stream(query):
+                    parts.append(text)
+                    if run_manager:
+                        await run_manager.on_text(text)
+                result = "".join(parts).strip()
             else:
-                logger.warning(f"[GEMINI GROUNDED SEARCH] ⚠️ NO GROUNDING METADATA - Model may have used internal knowledge instead of web search!")
+                client, load = self._pick_client()
+
+                async with load.acquire():
+                    response = await client.aio.models.generate_content(
+                        model=self._model,
+                        contents=query,
+                        config=self._build_config()
+                    )
+                result = self._parse_response(response)
+
+            if vector is not None:
+                _search_cache.store(vector, result, context, self._cache_metadata(query, context))
 
             return result
 
@@ -135,11 +571,71 @@ class GeminiWebSearchTool(BaseTool):
             logger.error(error_msg, exc_info=True)
             return f"I encountered an error while searching the web: {str(e)}"
 
-    async def _arun(self, query: str) -> str:
-        """Async version of _run (falls back to sync for now)."""
-        return self._run(query)
+    def batch_run(self, queries: List[str], timeout_seconds: float = BATCH_TIMEOUT_SECONDS) -> List[str]:
+        """
+        Run many searches as a single Gemini Batch Mode job.
+
+        Batch Mode costs about half as much as individual requests but may take
+        minutes to complete, so it is meant for bulk/offline workloads only.
 
+        Args:
+            queries: Search queries
+            timeout_seconds: Cancel the job if it has not finished by then
 
-def get_gemini_web_search_tool() -> GeminiWebSearchTool:
-    """Factory function to create Gemini web search tool instance."""
-    return GeminiWebSearchTool()
+        Returns:
+            One result per query, in the same order
+        """
+        if not queries:
+            return []
+
+        try:
+            config = self._build_config()
+            requests = [
+                types.InlinedRequest(contents=query, config=config)
+                for query in queries
+            ]
+
+            job = self._client.batches.create(
+                model=self._model,
+                src=requests,
+                config=types.CreateBatchJobConfig(display_name=f"web-search-batch-{len(queries)}")
+            )
+            logger.info(f"[GEMINI BATCH] Created batch job {job.name} with {len(queries)} queries")
+
+            deadline = time.monotonic() + timeout_seconds
+            while job.state.name not in _BATCH_DONE_STATES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._client.batches.cancel(name=job.name)
+                    raise TimeoutError(f"batch job {job.name} did not finish in time")
+                time.sleep(min(BATCH_POLL_SECONDS, remaining))
+                job = self._client.batches.get(name=job.name)
+
+            if job.state.name not in ("JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"):
+                raise RuntimeError(f"batch job {job.name} ended with state {job.state.name}")
+
+            results = []
+            for item in job.dest.inlined_responses:
+                if item.response:
+                    results.append(self._parse_response(item.response))
+                else:
+                    results.append(f"I encountered an error while searching the web: {item.error}")
+
+            logger.info(f"[GEMINI BATCH] Batch job {job.name} finished ({job.state.name})")
+            return results
+
+        except Exception as e:
+            error_msg = f"Error performing batch web search: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return [f"I encountered an error while searching the web: {str(e)}"] * len(queries)
+
+
+def get_gemini_web_search_tool(use_batch: bool = False, streaming: bool = False) -> GeminiWebSearchTool:
+    """
+    Factory function to create Gemini web search tool instance.
+
+    Args:
+        use_batch: Route async searches through Gemini Batch Mode (cheaper, not real-time)
+        streaming: Forward answer chunks to callbacks as they arrive
+    """
+    return GeminiWebSearchTool(use_batch=use_batch, streaming=streaming)
@@ -2,22 +2,151 @@
 Note-Taking Tool for saving user notes to the database and files.
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
-from typing import Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
+from typing import ClassVar, Dict, Optional, Sequence, Type
+import asyncio
+import io
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+import aiofiles
+from sqlalchemy import bindparam, func, or_, select
 
-from app.database import SessionLocal
+from app.database import SessionLocal, AsyncSessionLocal
 from app.models import Note, Conversation
-from app.config import get_settings, get_session_context
+from app.config import BASE_DIR, get_settings, get_session_context
+from app.services.semantic_cache import invalidate_caches
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Full-text search over the GIN-indexed notes.content_tsv, best matches first
+_NOTE_FTS_QUERY = func.plainto_tsquery("english", bindparam("term"))
+
+_NOTE_FTS_STMT = (
+    select(Note)
+    .where(Note.content_tsv.op("@@")(_NOTE_FTS_QUERY))
+    .order_by(func.ts_rank(Note.content_tsv, _NOTE_FTS_QUERY).desc(), Note.created_at.desc())
+)
+
+# Queries are built once and executed with a bound :pattern ("%term%")
+_NOTE_SEARCH_STMT = (
+    select(Note)
+    .where(or_(
+        Note.title.ilike(bindparam("pattern")),
+        Note.filename.ilike(bindparam("pattern")),
+        Note.content.ilike(bindparam("pattern"))
+    ))
+    .order_by(Note.created_at.desc())
+)
+
+_NOTE_EDIT_LOOKUP_STMT = (
+    select(Note)
+    .where(or_(
+        Note.title.ilike(bindparam("pattern")),
+        Note.filename.ilike(bindparam("pattern"))
+    ))
+    .order_by(Note.created_at.desc())
+)
+
+_NOTE_BY_FILENAME_STMT = (
+    select(Note)
+    .where(Note.filename == bindparam("filename"))
+    .order_by(Note.created_at.desc())
+    .limit(1)
+)
+
+# One page of the note list. Only a preview of the content is read (substr runs in the
+# database) and the window count gives the total without a second query.
+NOTE_LIST_PAGE_SIZE = 50
+NOTE_PREVIEW_LENGTH = 60
+
+_NOTE_LIST_STMT = (
+    select(
+        Note.id,
+        Note.title,
+        Note.filename,
+        Note.created_at,
+        func.substr(Note.content, 1, NOTE_PREVIEW_LENGTH + 1).label("preview"),
+        func.count().over().label("total")
+    )
+    .order_by(Note.created_at.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+# Characters not allowed in filenames, all mapped to '_' in a single translate() pass
+_INVALID_FN_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Timestamp formats: note file headers, fallback filenames, list output
+_TS_LONG = "%Y-%m-%d %H:%M:%S"
+_TS_FILE = "%Y%m%d_%H%M%S"
+_TS_SHORT = "%Y-%m-%d %H:%M"
+
+
+def _now() -> datetime:
+    """Current time in UTC (timezone-aware, matching the timestamptz columns)."""
+    return datetime.now(timezone.utc)
+
+
+# Latest background write per note file, written by the async tools. Each write waits
+# for the previous one to the same file, so files end up with the latest text (and
+# tasks aren't GC'd mid-write).
+_pending_file_writes: Dict[Path, asyncio.Task] = {}
+
+
+def _write_note_text(file_path: Path, text: str) -> None:
+    """Write a note file synchronously."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    logger.info(f"Note saved to file: {file_path}")
+
+
+async def _write_note_text_async(file_path: Path, text: str) -> None:
+    """Write a note file without blocking the event loop."""
+    try:
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+            await f.write(text)
+        logger.info(f"Note saved to file: {file_path}")
+    except Exception as e:
+        # The DB row is the source of truth; a failed file copy is only logged
+        logger.error(f"Error writing note file {file_path}: {str(e)}", exc_info=True)
+
+
+def _invalidate_cached_answers(session_id: Optional[str]) -> None:
+    """
+    Drop cached answers that may be stale after a note was saved or edited:
+    ones about notes, and context-dependent ones from the same session.
+    """
+    invalidate_caches(
+        lambda meta: "note" in meta.get("query", "").lower()
+        or (session_id is not None and meta.get("context") == session_id)
+    )
+
+
+async def _write_after(previous: Optional[asyncio.Task], file_path: Path, text: str) -> None:
+    """Write a note file once the previous write to it has finished."""
+    if previous is not None:
+        await asyncio.wait([previous])
+    await _write_note_text_async(file_path, text)
+
+
+def _schedule_note_write(file_path: Path, text: str) -> None:
+    """Write a note file in a background task so the caller only waits on the DB."""
+    task = asyncio.create_task(_write_after(_pending_file_writes.get(file_path), file_path, text))
+    _pending_file_writes[file_path] = task
+
+    def forget(done: asyncio.Task) -> None:
+        if _pending_file_writes.get(file_path) is done:
+            del _pending_file_writes[file_path]
+
+    task.add_done_callback(forget)
+
 
 class NoteTakingInput(BaseModel):
     """Input schema for note-taking tool."""
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(description="Title or filename for the note")
     content: str = Field(description="The content of the note to save")
 
@@ -43,6 +172,13 @@ class NoteTakingTool(BaseTool):
     )
     args_schema: Type[BaseModel] = NoteTakingInput
 
+    # Resolved once; the directory is created when the tool is instantiated
+    notes_dir: ClassVar[Path] = BASE_DIR / "data" / "user_notes"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.notes_dir.mkdir(parents=True, exist_ok=True)
+
     def _run(self, title: str, content: str) -> str:
         """
         Save a note to both database and file system.
@@ -59,63 +195,32 @@ class NoteTakingTool(BaseTool):
             session_id = get_session_context()
             logger.info(f"Saving note: {title} (session: {session_id or 'none'})")
 
+            filename = self._sanitize_filename(title)
+
             # Create database session
             db = SessionLocal()
 
             try:
-                # Clean filename
-                filename = self._sanitize_filename(title)
-
-                # Create user_notes directory if it doesn't exist
-                from app.config import BASE_DIR
-                notes_dir = Path(BASE_DIR) / "data" / "user_notes"
-                notes_dir.mkdir(parents=True, exist_ok=True)
-
-                # Save to file system
-                file_path = notes_dir / filename
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"Title: {title}\n")
-                    f.write(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    if session_id:
-                        f.write(f"Session: {session_id}\n")
-                    f.write(f"\n{'-' * 50}\n\n")
-                    f.write(content)
-
-                logger.info(f"Note saved to file: {file_path}")
-
-                # Create note in database
-                note = Note(
-                    user_id=1,  # Default user for now
-                    filename=filename,
-                    title=title,
-                    content=content
-                )
-
+                note = self._new_note(filename, title, content)
                 db.add(note)
+
+                # Add system message to conversation history if session_id provided
+                # (same transaction as the note, so a single commit)
+                if session_id:
+                    db.add(self._saved_message(session_id, title, filename))
+
                 db.commit()
                 db.refresh(note)
 
-                # Add system message to conversation history if session_id provided
                 if session_id:
-                    system_msg = Conversation(
-                        session_id=session_id,
-                        role="system",
-                        message=f"[SYSTEM] Note saved: '{title}' (File: {filename}). User can retrieve this note anytime."
-                    )
-                    db.add(system_msg)
-                    db.commit()
                     logger.info(f"Added note creation notification to session: {session_id}")
 
-                logger.info(f"Successfully saved note: {filename} (ID: {note.id})")
+                # Save to file system once the DB row is committed
+                _write_note_text(self.notes_dir / filename, self._file_text(title, content, session_id))
+                _invalidate_cached_answers(session_id)
 
-                return (
-                    f"Note saved successfully!\n"
-                    f"Title: {title}\n"
-                    f"Filename: {filename}\n"
-                    f"Location: data/user_notes/{filename}\n"
-                    f"Note ID: {note.id}\n"
-                    f"You can retrieve this note anytime by asking for '{title}'."
-                )
+                logger.info(f"Successfully saved note: {filename} (ID: {note.id})")
+                return self._format_saved(title, filename, note.id)
 
             finally:
                 db.close()
@@ -126,8 +231,75 @@ class NoteTakingTool(BaseTool):
             return f"Failed to save note: {str(e)}"
 
     async def _arun(self, title: str, content: str) -> str:
-        """Async version (falls back to sync)."""
-        return self._run(title, content)
+        """Async version using an AsyncSession, so DB I/O doesn't block the event loop."""
+        try:
+            session_id = get_session_context()
+            logger.info(f"Saving note: {title} (session: {session_id or 'none'})")
+
+            filename = self._sanitize_filename(title)
+
+            async with AsyncSessionLocal() as db:
+                note = self._new_note(filename, title, content)
+                db.add(note)
+
+                if session_id:
+                    db.add(self._saved_message(session_id, title, filename))
+
+                await db.commit()
+
+                if session_id:
+                    logger.info(f"Added note creation notification to session: {session_id}")
+
+            # File copy is written in the background; the response only waits on the DB
+            _schedule_note_write(self.notes_dir / filename, self._file_text(title, content, session_id))
+            _invalidate_cached_answers(session_id)
+
+            logger.info(f"Successfully saved note: {filename} (ID: {note.id})")
+            return self._format_saved(title, filename, note.id)
+
+        except Exception as e:
+            error_msg = f"Error saving note: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return f"Failed to save note: {str(e)}"
+
+    @staticmethod
+    def _file_text(title: str, content: str, session_id: Optional[str]) -> str:
+        """Full file contents: header lines followed by the note body."""
+        return "".join([
+            f"Title: {title}\n",
+            f"Created: {_now().strftime(_TS_LONG)}\n",
+            f"Session: {session_id}\n" if session_id else "",
+            f"\n{'-' * 50}\n\n",
+            content
+        ])
+
+    @staticmethod
+    def _new_note(filename: str, title: str, content: str) -> Note:
+        return Note(
+            user_id=1,  # Default user for now
+            filename=filename,
+            title=title,
+            content=content
+        )
+
+    @staticmethod
+    def _saved_message(session_id: str, title: str, filename: str) -> Conversation:
+        return Conversation(
+            session_id=session_id,
+            role="system",
+            message=f"[SYSTEM] Note saved: '{title}' (File: {filename}). User can retrieve this note anytime."
+        )
+
+    @staticmethod
+    def _format_saved(title: str, filename: str, note_id: int) -> str:
+        return (
+            f"Note saved successfully!\n"
+            f"Title: {title}\n"
+            f"Filename: {filename}\n"
+            f"Location: data/user_notes/{filename}\n"
+            f"Note ID: {note_id}\n"
+            f"You can retrieve this note anytime by asking for '{title}'."
+        )
 
     def _sanitize_filename(self, title: str) -> str:
         """
@@ -140,11 +312,7 @@ class NoteTakingTool(BaseTool):
             Sanitized filename
         """
         # Remove invalid filename characters
-        invalid_chars = '<>:"/\\|?*'
-        filename = title
-
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
+        filename = title.translate(_INVALID_FN_TABLE)
 
         # Truncate if too long
         if len(filename) > 100:
@@ -152,7 +320,7 @@ class NoteTakingTool(BaseTool):
 
         # Add timestamp if filename is too generic
         if len(filename) < 3:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = _now().strftime(_TS_FILE)
             filename = f"note_{timestamp}"
 
         # Ensure it has .txt extension
@@ -164,6 +332,8 @@ class NoteTakingTool(BaseTool):
 
 class NoteRetrievalInput(BaseModel):
     """Input schema for note retrieval tool."""
+    model_config = ConfigDict(frozen=True)
+
     search_term: str = Field(description="Title, filename, or keyword to search for in notes")
 
 
@@ -199,40 +369,16 @@ class NoteRetrievalTool(BaseTool):
             db = SessionLocal()
 
             try:
-                # Search in title, filename, and content
-                notes = db.query(Note).filter(
-                    (Note.title.ilike(f"%{search_term}%")) |
-                    (Note.filename.ilike(f"%{search_term}%")) |
-                    (Note.content.ilike(f"%{search_term}%"))
-                ).order_by(Note.created_at.desc()).all()
+                # Full-text search in title and content
+                notes = db.execute(_NOTE_FTS_STMT, {"term": search_term}).scalars().all()
 
                 if not notes:
-                    return f"No notes found matching '{search_term}'. Try a different search term or ask me to list all notes."
-
-                # Format results
-                if len(notes) == 1:
-                    note = notes[0]
-                    return (
-                        f"📝 Note Found:\n\n"
-                        f"Title: {note.title}\n"
-                        f"Filename: {note.filename}\n"
-                        f"Created: {note.created_at}\n"
-                        f"\nContent:\n{note.content}"
-                    )
-                else:
-                    result = [f"Found {len(notes)} notes matching '{search_term}':\n"]
-                    for idx, note in enumerate(notes[:5], 1):  # Limit to 5 results
-                        preview = note.content[:100] + "..." if len(note.content) > 100 else note.content
-                        result.append(
-                            f"{idx}. {note.title}\n"
-                            f"   ID: {note.id} | Created: {note.created_at}\n"
-                            f"   Preview: {preview}\n"
-                        )
-
-                    if len(notes) > 5:
-                        result.append(f"\n... and {len(notes) - 5} more. Try a more specific search.")
-
-                    return "\n".join(result)
+                    # FTS only matches whole (stemmed) words; fall back to substring
+                    # search in title, filename, and content
+                    notes = db.execute(
+                        _NOTE_SEARCH_STMT, {"pattern": f"%{search_term}%"}
+                    ).scalars().all()
+                return self._format_notes(notes, search_term)
 
             finally:
                 db.close()
@@ -243,12 +389,62 @@ class NoteRetrievalTool(BaseTool):
             return error_msg
 
     async def _arun(self, search_term: str) -> str:
-        """Async version (falls back to sync)."""
-        return self._run(search_term)
+        """Async version using an AsyncSession, so DB I/O doesn't block the event loop."""
+        try:
+            logger.info(f"Searching for notes: {search_term}")
+
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(_NOTE_FTS_STMT, {"term": search_term})
+                notes = result.scalars().all()
+
+                if not notes:
+                    result = await db.execute(_NOTE_SEARCH_STMT, {"pattern": f"%{search_term}%"})
+                    notes = result.scalars().all()
+
+            return self._format_notes(notes, search_term)
+
+        except Exception as e:
+            error_msg = f"Error retrieving notes: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return error_msg
+
+    @staticmethod
+    def _format_notes(notes: Sequence[Note], search_term: str) -> str:
+        """Format matching notes: full content for one match, previews for several."""
+        if not notes:
+            return f"No notes found matching '{search_term}'. Try a different search term or ask me to list all notes."
+
+        # Format results
+        if len(notes) == 1:
+            note = notes[0]
+            return (
+                f"📝 Note Found:\n\n"
+                f"Title: {note.title}\n"
+                f"Filename: {note.filename}\n"
+                f"Created: {note.created_at}\n"
+                f"\nContent:\n{note.content}"
+            )
+        else:
+            buf = io.StringIO()
+            buf.write(f"Found {len(notes)} notes matching '{search_term}':\n")
+            for idx, note in enumerate(notes[:5], 1):  # Limit to 5 results
+                preview = note.content[:100] + "..." if len(note.content) > 100 else note.content
+                buf.write(
+                    f"\n{idx}. {note.title}\n"
+                    f"   ID: {note.id} | Created: {note.created_at}\n"
+                    f"   Preview: {preview}\n"
+                )
+
+            if len(notes) > 5:
+                buf.write(f"\n\n... and {len(notes) - 5} more. Try a more specific search.")
+
+            return buf.getvalue()
 
 
 class NoteEditInput(BaseModel):
     """Input schema for note editing tool."""
+    model_config = ConfigDict(frozen=True)
+
     search_term: str = Field(description="Title or filename of the note to edit")
     new_content: str = Field(description="New content to replace the old content, or content to append")
     mode: str = Field(
@@ -276,6 +472,8 @@ class NoteEditTool(BaseTool):
     )
     args_schema: Type[BaseModel] = NoteEditInput
 
+    notes_dir: ClassVar[Path] = NoteTakingTool.notes_dir
+
     def _run(self, search_term: str, new_content: str, mode: str = "replace") -> str:
         """
         Edit an existing note.
@@ -297,69 +495,40 @@ class NoteEditTool(BaseTool):
             db = SessionLocal()
 
             try:
-                # Search for the note
-                notes = db.query(Note).filter(
-                    (Note.title.ilike(f"%{search_term}%")) |
-                    (Note.filename.ilike(f"%{search_term}%"))
-                ).order_by(Note.created_at.desc()).all()
-
-                if not notes:
-                    return f"No note found matching '{search_term}'. Please check the title and try again."
-
-                if len(notes) > 1:
-                    # Multiple matches - list them
-                    result = [f"Found {len(notes)} notes matching '{search_term}'. Please be more specific:\n"]
-                    for idx, note in enumerate(notes[:5], 1):
-                        result.append(f"{idx}. {note.title} (ID: {note.id})")
-                    return "\n".join(result)
+                # Exact ID / filename (as shown by list_notes) is an index lookup
+                note = None
+                if search_term.isdigit():
+                    note = db.get(Note, int(search_term))
+                elif search_term.endswith('.txt'):
+                    note = db.execute(
+                        _NOTE_BY_FILENAME_STMT, {"filename": search_term}
+                    ).scalars().first()
+
+                if note is None:
+                    # Search for the note
+                    notes = db.execute(
+                        _NOTE_EDIT_LOOKUP_STMT, {"pattern": f"%{search_term}%"}
+                    ).scalars().all()
+
+                    if len(notes) != 1:
+                        return self._format_no_single_match(notes, search_term)
+                    note = notes[0]
 
                 # Edit the note
-                note = notes[0]
-                old_content = note.content
+                action = self._apply_edit(note, new_content, mode)
 
-                if mode == "append":
-                    note.content = old_content + "\n\n" + new_content
-                    action = "appended to"
-                else:  # replace
-                    note.content = new_content
-                    action = "replaced"
+                # Add system message to conversation history (same transaction as the edit)
+                if session_id:
+                    db.add(self._edited_message(session_id, note.title, action))
 
-                note.updated_at = datetime.now()
                 db.commit()
 
                 # Update file system
-                from app.config import BASE_DIR
-                notes_dir = Path(BASE_DIR) / "data" / "user_notes"
-                file_path = notes_dir / note.filename
-
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"Title: {note.title}\n")
-                    f.write(f"Created: {note.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"Updated: {note.updated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    if session_id:
-                        f.write(f"Session: {session_id}\n")
-                    f.write(f"\n{'-' * 50}\n\n")
-                    f.write(note.content)
-
+                _write_note_text(self.notes_dir / note.filename, self._file_text(note, session_id))
+                _invalidate_cached_answers(session_id)
                 logger.info(f"Successfully edited note: {note.filename} (ID: {note.id})")
 
-                # Add system message to conversation history
-                if session_id:
-                    system_msg = Conversation(
-                        session_id=session_id,
-                        role="system",
-                        message=f"[SYSTEM] Note edited: '{note.title}' (content {action})."
-                    )
-                    db.add(system_msg)
-                    db.commit()
-
-                return (
-                    f"Note '{note.title}' updated successfully!\n"
-                    f"Filename: {note.filename}\n"
-                    f"Location: data/user_notes/{note.filename}\n"
-                    f"Action: Content {action}\n"
-                    f"Note ID: {note.id}"
-                )
+                return self._format_edited(note, action)
 
             finally:
                 db.close()
@@ -370,16 +539,120 @@ class NoteEditTool(BaseTool):
             return error_msg
 
     async def _arun(self, search_term: str, new_content: str, mode: str = "replace") -> str:
-        """Async version (falls back to sync)."""
-        return self._run(search_term, new_content, mode)
+        """Async version using an AsyncSession, so DB I/O doesn't block the event loop."""
+        try:
+            logger.info(f"Editing note: {search_term} (mode: {mode})")
+
+            session_id = get_session_context()
+
+            async with AsyncSessionLocal() as db:
+                note = None
+                if search_term.isdigit():
+                    note = await db.get(Note, int(search_term))
+                elif search_term.endswith('.txt'):
+                    result = await db.execute(_NOTE_BY_FILENAME_STMT, {"filename": search_term})
+                    note = result.scalars().first()
+
+                if note is None:
+                    result = await db.execute(_NOTE_EDIT_LOOKUP_STMT, {"pattern": f"%{search_term}%"})
+                    notes = result.scalars().all()
+
+                    if len(notes) != 1:
+                        return self._format_no_single_match(notes, search_term)
+                    note = notes[0]
+
+                action = self._apply_edit(note, new_content, mode)
+
+                if session_id:
+                    db.add(self._edited_message(session_id, note.title, action))
+
+                await db.commit()
+
+                # File copy is written in the background; the response only waits on the DB
+                _schedule_note_write(self.notes_dir / note.filename, self._file_text(note, session_id))
+                _invalidate_cached_answers(session_id)
+                logger.info(f"Successfully edited note: {note.filename} (ID: {note.id})")
+
+            return self._format_edited(note, action)
+
+        except Exception as e:
+            error_msg = f"Error editing note: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return error_msg
+
+    @staticmethod
+    def _apply_edit(note: Note, new_content: str, mode: str) -> str:
+        """Update the note's content in place and return the action performed."""
+        if mode == "append":
+            note.content = note.content + "\n\n" + new_content
+            action = "appended to"
+        else:  # replace
+            note.content = new_content
+            action = "replaced"
+
+        note.updated_at = _now()
+        return action
+
+    @staticmethod
+    def _file_text(note: Note, session_id: Optional[str]) -> str:
+        """Full file contents: header lines followed by the note body."""
+        return "".join([
+            f"Title: {note.title}\n",
+            f"Created: {note.created_at.strftime(_TS_LONG)}\n",
+            f"Updated: {note.updated_at.strftime(_TS_LONG)}\n",
+            f"Session: {session_id}\n" if session_id else "",
+            f"\n{'-' * 50}\n\n",
+            note.content
+        ])
+
+    @staticmethod
+    def _edited_message(session_id: str, title: str, action: str) -> Conversation:
+        return Conversation(
+            session_id=session_id,
+            role="system",
+            message=f"[SYSTEM] Note edited: '{title}' (content {action})."
+        )
+
+    @staticmethod
+    def _format_no_single_match(notes: Sequence[Note], search_term: str) -> str:
+        if not notes:
+            return f"No note found matching '{search_term}'. Please check the title and try again."
+
+        # Multiple matches - list them
+        result = [f"Found {len(notes)} notes matching '{search_term}'. Please be more specific:\n"]
+        for idx, note in enumerate(notes[:5], 1):
+            result.append(f"{idx}. {note.title} (ID: {note.id})")
+        return "\n".join(result)
+
+    @staticmethod
+    def _format_edited(note: Note, action: str) -> str:
+        return (
+            f"Note '{note.title}' updated successfully!\n"
+            f"Filename: {note.filename}\n"
+            f"Location: data/user_notes/{note.filename}\n"
+            f"Action: Content {action}\n"
+            f"Note ID: {note.id}"
+        )
 
 
 class NoteListInput(BaseModel):
     """Input schema for note listing tool."""
+    model_config = ConfigDict(frozen=True)
+
     query: str = Field(
         default="list",
         description="Optional query to filter notes, or 'list' to show all"
     )
+    limit: int = Field(
+        default=NOTE_LIST_PAGE_SIZE,
+        ge=1,
+        description="Maximum number of notes to list"
+    )
+    offset: int = Field(
+        default=0,
+        ge=0,
+        description="Number of most recent notes to skip (for the next page)"
+    )
 
 
 class NoteListTool(BaseTool):
@@ -400,12 +673,14 @@ class NoteListTool(BaseTool):
     )
     args_schema: Type[BaseModel] = NoteListInput
 
-    def _run(self, query: str = "list") -> str:
+    def _run(self, query: str = "list", limit: int = NOTE_LIST_PAGE_SIZE, offset: int = 0) -> str:
         """
-        List all available notes.
+        List available notes, most recent first, one page at a time.
 
         Args:
             query: Optional filter query
+            limit: Page size
+            offset: Number of notes to skip
 
         Returns:
             Formatted list of notes
@@ -416,40 +691,69 @@ class NoteListTool(BaseTool):
             db = SessionLocal()
 
             try:
-                # Get all notes
-                notes = db.query(Note).order_by(Note.created_at.desc()).all()
-
-                if not notes:
-                    return "No notes found in the database. You can create a new note by asking me to save one."
+                rows = db.execute(_NOTE_LIST_STMT, {"limit": limit, "offset": offset}).all()
+                return self._format_notes(rows, offset)
 
-                # Format results
-                result = [f"Available Notes ({len(notes)} total):\n"]
+            finally:
+                db.close()
 
-                for idx, note in enumerate(notes, 1):
-                    preview = note.content[:60] + "..." if len(note.content) > 60 else note.content
-                    result.append(
-                        f"{idx}. Title: {note.title}\n"
-                        f"   ID: {note.id} | Filename: {note.filename}\n"
-                        f"   Created: {note.created_at.strftime('%Y-%m-%d %H:%M')}\n"
-                        f"   Preview: {preview}\n"
-                    )
+        except Exception as e:
+            error_msg = f"Error listing notes: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return error_msg
 
-                result.append("\nTo view full content of any note, ask me to retrieve it by title or ID.")
+    async def _arun(self, query: str = "list", limit: int = NOTE_LIST_PAGE_SIZE, offset: int = 0) -> str:
+        """Async version using an AsyncSession, so DB I/O doesn't block the event loop."""
+        try:
+            logger.info(f"Listing notes (query: {query})")
 
-                logger.info(f"Listed {len(notes)} notes")
-                return "\n".join(result)
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(_NOTE_LIST_STMT, {"limit": limit, "offset": offset})
+                rows = result.all()
 
-            finally:
-                db.close()
+            return self._format_notes(rows, offset)
 
         except Exception as e:
             error_msg = f"Error listing notes: {str(e)}"
             logger.error(error_msg, exc_info=True)
             return error_msg
 
-    async def _arun(self, query: str = "list") -> str:
-        """Async version (falls back to sync)."""
-        return self._run(query)
+    @staticmethod
+    def _format_notes(rows: Sequence, offset: int) -> str:
+        """Format one page of _NOTE_LIST_STMT rows."""
+        if not rows:
+            if offset:
+                return f"No more notes (there are fewer than {offset + 1} notes)."
+            return "No notes found in the database. You can create a new note by asking me to save one."
+
+        total = rows[0].total
+
+        # Format results (one write per row)
+        buf = io.StringIO()
+        buf.write(f"Available Notes ({total} total):\n")
+
+        for idx, row in enumerate(rows, offset + 1):
+            preview = row.preview
+            if len(preview) > NOTE_PREVIEW_LENGTH:
+                preview = preview[:NOTE_PREVIEW_LENGTH] + "..."
+            buf.write(
+                f"\n{idx}. Title: {row.title}\n"
+                f"   ID: {row.id} | Filename: {row.filename}\n"
+                f"   Created: {row.created_at.strftime(_TS_SHORT)}\n"
+                f"   Preview: {preview}\n"
+            )
+
+        shown_until = offset + len(rows)
+        if shown_until < total:
+            buf.write(
+                f"\n\nShowing notes {offset + 1}-{shown_until} of {total}. "
+                f"Ask for more notes to see the next page (offset {shown_until})."
+            )
+
+        buf.write("\n\nTo view full content of any note, ask me to retrieve it by title or ID.")
+
+        logger.info(f"Listed {len(rows)} of {total} notes")
+        return buf.getvalue()
 
 
 def get_note_taking_tool() -> NoteTakingTool:
@@ -2,18 +2,64 @@
 RAG Search Tool for querying the knowledge base.
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
-from typing import Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
+from typing import ClassVar, Dict, FrozenSet, List, Optional, Set, Type
+import asyncio
+import io
 import logging
+import os
 
 from app.services.vector_store import get_vector_store
-from app.config import get_session_context
+from app.config import get_settings, get_session_context
+from app.tools._rag_cache import get_query_cache, get_semantic_cache
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_EMPTY_KNOWLEDGE_BASE = (
+    "The knowledge base is currently empty. No documents have been uploaded yet. "
+    "Please upload documents using the /api/upload-document endpoint before querying."
+)
+
+# Character shingles used to detect near-duplicate results
+SHINGLE_SIZE = 32
+SHINGLE_STEP = 16
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """
+    Shorten text to at most max_chars, preferring to cut after a sentence.
+
+    Falls back to a hard cut when there is no sentence end in the second half.
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+
+    cut = text.rfind(". ", 0, max_chars)
+    if cut >= max_chars // 2:
+        return text[:cut + 1] + " ..."
+    return text[:max_chars].rstrip() + " ..."
+
+
+def _shingles(text: str) -> FrozenSet[str]:
+    """Overlapping character shingles of text."""
+    last_start = max(len(text) - SHINGLE_SIZE, 0)
+    return frozenset(text[i:i + SHINGLE_SIZE] for i in range(0, last_start + 1, SHINGLE_STEP))
+
+
+def _is_near_duplicate(shingles: FrozenSet[str], kept: List[FrozenSet[str]], threshold: float) -> bool:
+    """Whether shingles overlap any kept result by more than threshold (Jaccard)."""
+    for other in kept:
+        union = len(shingles | other)
+        if union and len(shingles & other) / union > threshold:
+            return True
+    return False
 
 
 class RAGSearchInput(BaseModel):
     """Input schema for RAG search tool."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     query: str = Field(description="The question or query to search in the knowledge base")
     k: Optional[int] = Field(
         default=3,
@@ -49,6 +95,10 @@ class RAGSearchTool(BaseTool):
     )
     args_schema: Type[BaseModel] = RAGSearchInput
 
+    # Searches currently running in a worker thread, by query cache key. Only touched
+    # from the event loop, and there is no await between lookup and insert.
+    _inflight: ClassVar[Dict[str, asyncio.Future]] = {}
+
     def _run(self, query: str, k: int = 3) -> str:
         """
         Execute RAG search.
@@ -61,81 +111,231 @@ class RAGSearchTool(BaseTool):
             Formatted string with relevant information from documents
         """
         try:
-            logger.info(f"Performing RAG search for: {query}")
+            logger.info("Performing RAG search for: %s", query)
 
-            # Get vector store instance
-            vector_store = get_vector_store()
+            # Get session context to filter documents from current session
+            session_id = get_session_context()
+            logger.info("[RAG DEBUG] Session context retrieved: %s", session_id or "None (no filtering)")
 
-            # Check if there are any documents in the knowledge base
-            stats = vector_store.get_collection_stats()
-            total_docs = stats.get('total_documents', 0)
+            # Same question in the same session: reuse the formatted result
+            cache = get_query_cache()
+            cache_key = cache.make_key(session_id, k, query)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("[RAG CACHE] Cache hit")
+                return cached
 
-            if total_docs == 0:
-                return (
-                    "The knowledge base is currently empty. No documents have been uploaded yet. "
-                    "Please upload documents using the /api/upload-document endpoint before querying."
-                )
+            # Paraphrase of an earlier question in the same session: reuse its result.
+            # The query embedding is cached, so the search below does not recompute it.
+            vector = None
+            context = (session_id, k)
+            if settings.RAG_SEMANTIC_CACHE_ENABLED:
+                vector = get_vector_store().embeddings.embed_query(query)
+                cached = get_semantic_cache().lookup(vector, context)
+                if cached is not None:
+                    logger.info("[RAG CACHE] Semantic cache hit")
+                    cache.set(cache_key, session_id, cached)
+                    return cached
 
-            logger.info(f"Knowledge base has {total_docs} document chunks available")
+            result = self._search(query, k, session_id)
+            if result is not _EMPTY_KNOWLEDGE_BASE:
+                cache.set(cache_key, session_id, result)
+                if vector is not None:
+                    get_semantic_cache().store(
+                        vector, result, context,
+                        {"tool": self.name, "query": query, "session_id": session_id}
+                    )
+            return result
 
-            # Get session context to filter documents from current session
-            session_id = get_session_context()
-            logger.info(f"[RAG DEBUG] Session context retrieved: {session_id if session_id else 'None (no filtering)'}")
-            filter_metadata = {"session_id": session_id} if session_id else None
+        except Exception as e:
+            error_msg = f"Error performing RAG search: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return error_msg
 
-            if filter_metadata:
-                logger.info(f"[RAG FILTER] Filtering search results to session: {session_id}")
+    def _search(self, query: str, k: int, session_id: Optional[str]) -> str:
+        """
+        Search the vector store and format the results.
 
-            # Search for relevant documents with optional session filter
-            results = vector_store.search(query, k=k, filter_metadata=filter_metadata)
+        Args:
+            query: Search query/question
+            k: Number of relevant chunks to retrieve
+            session_id: Session to filter documents by (None = all documents)
 
-            if not results:
-                return (
-                    f"I searched through {total_docs} document chunks in the knowledge base, "
-                    f"but couldn't find information relevant to '{query}'. "
-                    f"Try rephrasing your question or asking about different topics covered in the uploaded documents."
-                )
+        Returns:
+            Formatted string with relevant information from documents
+        """
+        vector_store = get_vector_store()
 
-            # Format results with source tracking
-            formatted_results = [f"Found {len(results)} relevant results in the knowledge base:\n"]
-            sources_found = set()  # Track which documents the results came from
+        # Search for relevant documents with optional session filter
+        results = vector_store.search(query, k=k, filter_metadata=self._session_filter(session_id))
+        if not results:
+            return self._no_results_message(query, vector_store)
 
-            for idx, result in enumerate(results, 1):
-                content = result['content']
-                metadata = result['metadata']
-                score = result['similarity_score']
+        return self._format_results(query, results)
 
-                # Extract metadata
-                source = metadata.get('source', 'Unknown')
-                page = metadata.get('page', 'N/A')
-                sources_found.add(source)
+    def batch_run(self, queries: List[str], k: int = 3) -> List[str]:
+        """
+        Run several RAG searches together (e.g. sub-questions of one question).
 
-                formatted_results.append(
-                    f"\n--- Result {idx} (Relevance: {score:.2f}) ---\n"
-                    f"Source: {source} (Page {page})\n"
-                    f"Content: {content}\n"
-                )
+        Cached queries are answered from the query cache; the rest are embedded
+        in one model call, then each vector is searched on its own (Chroma has
+        no multi-query similarity search).
 
-            # Add summary of which documents were searched
-            if sources_found:
-                sources_list = "', '".join([s.split('/')[-1] if '/' in s else s for s in sources_found])
-                formatted_results.insert(1, f"\nSearch results from document(s): '{sources_list}'\n")
+        Args:
+            queries: Search queries/questions
+            k: Number of relevant chunks to retrieve per query
 
-            final_result = "\n".join(formatted_results)
-            logger.info(f"Found {len(results)} relevant chunks from {len(sources_found)} document(s): {sources_found}")
+        Returns:
+            One formatted result per query, in the same order
+        """
+        try:
+            logger.info("Performing batched RAG search for %d queries", len(queries))
+            session_id = get_session_context()
 
-            return final_result
+            cache = get_query_cache()
+            cache_keys = [cache.make_key(session_id, k, query) for query in queries]
+            outputs = [cache.get(cache_key) for cache_key in cache_keys]
+            missing = [i for i, output in enumerate(outputs) if output is None]
+
+            if not missing:
+                logger.info("[RAG CACHE] Cache hit for every query in batch")
+                return outputs
+
+            vector_store = get_vector_store()
+            results = vector_store.batch_search(
+                [queries[i] for i in missing], k=k, filter_metadata=self._session_filter(session_id)
+            )
+
+            for i, query_results in zip(missing, results):
+                if query_results:
+                    outputs[i] = self._format_results(queries[i], query_results)
+                else:
+                    outputs[i] = self._no_results_message(queries[i], vector_store)
+
+                if outputs[i] is not _EMPTY_KNOWLEDGE_BASE:
+                    cache.set(cache_keys[i], session_id, outputs[i])
+
+            return outputs
 
         except Exception as e:
             error_msg = f"Error performing RAG search: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            return error_msg
+            return [error_msg] * len(queries)
+
+    @staticmethod
+    def _session_filter(session_id: Optional[str]) -> Optional[dict]:
+        """Metadata filter restricting a search to the current session's documents."""
+        if not session_id:
+            return None
+
+        logger.info("[RAG FILTER] Filtering search results to session: %s", session_id)
+        return {"session_id": session_id}
+
+    @staticmethod
+    def _no_results_message(query: str, vector_store) -> str:
+        """
+        Explain an empty search result.
+
+        The collection size is only looked up here, so searches that find
+        something never pay for it.
+        """
+        total_docs = vector_store.get_collection_stats().get('total_documents', 0)
+
+        if total_docs == 0:
+            return _EMPTY_KNOWLEDGE_BASE
+
+        logger.info("Knowledge base has %d document chunks available", total_docs)
+        return (
+            f"I searched through {total_docs} document chunks in the knowledge base, "
+            f"but couldn't find information relevant to '{query}'. "
+            f"Try rephrasing your question or asking about different topics covered in the uploaded documents."
+        )
+
+    def _format_results(self, query: str, results: List[dict]) -> str:
+        """Format vector store results for the LLM."""
+        # Format each result, tracking which documents they came from. Near-duplicate
+        # chunks are dropped and long ones shortened to keep the LLM prompt small.
+        rows = []
+        sources_found: Set[str] = set()
+        kept_shingles = []
+
+        for result in results:
+            content = result['content']
+            shingles = _shingles(content)
+            if _is_near_duplicate(shingles, kept_shingles, settings.RAG_RESULT_DEDUP_THRESHOLD):
+                continue
+            kept_shingles.append(shingles)
+            content = _truncate(content, settings.RAG_RESULT_MAX_CHARS)
+
+            idx = len(rows) + 1
+            metadata = result['metadata']
+            score = result['similarity_score']
+            relevance = f"{score:.2f}" if score is not None else "N/A"
+
+            # Extract metadata
+            source = metadata.get('source', 'Unknown')
+            page = metadata.get('page', 'N/A')
+            sources_found.add(source)
+
+            rows.append(
+                f"\n--- Result {idx} (Relevance: {relevance}) ---\n"
+                f"Source: {source} (Page {page})\n"
+                f"Content: {content}\n"
+            )
+
+        # Compose header, summary of which documents were searched, then the results
+        buf = io.StringIO()
+        buf.write(f"Found {len(rows)} relevant results in the knowledge base:\n")
+        if sources_found:
+            sources_list = "', '".join(sorted(os.path.basename(s) for s in sources_found))
+            buf.write(f"\n\nSearch results from document(s): '{sources_list}'\n")
+        for row in rows:
+            buf.write("\n")
+            buf.write(row)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Found %d relevant chunks (%d near-duplicates dropped) from %d document(s): %s",
+                len(results), len(results) - len(rows), len(sources_found), sources_found
+            )
+
+        return buf.getvalue()
 
     async def _arun(self, query: str, k: int = 3) -> str:
-        """Async version of _run (falls back to sync)."""
-        return self._run(query, k)
+        """
+        Async version of _run.
+
+        The blocking embedding + vector search runs in a worker thread, and
+        concurrent identical searches (same session, k and query) share one run.
+        """
+        key = get_query_cache().make_key(get_session_context(), k, query)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self._run, query, k))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info("[RAG] Joining in-flight search for: %s", query)
+
+        # Shielded so a cancelled caller doesn't cancel the search for the others
+        return await asyncio.shield(task)
+
+
+# Singleton instance
+_rag_search_tool_instance = None
 
 
 def get_rag_search_tool() -> RAGSearchTool:
-    """Factory function to create RAG search tool instance."""
-    return RAGSearchTool()
\ No newline at end of file
+    """
+    Get or create the RAG search tool instance (singleton).
+
+    Returns:
+        RAGSearchTool instance
+    """
+    global _rag_search_tool_instance
+
+    if _rag_search_tool_instance is None:
+        _rag_search_tool_instance = RAGSearchTool()
+
+    return _rag_search_tool_instance
\ No newline at end of file
@@ -5,19 +5,121 @@ Tavily provides real-time web search optimized for LLM consumption.
 Free tier: 1,000 searches/month
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Type
+import asyncio
+import atexit
 import httpx
 import logging
+import random
+import threading
+import time
 
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Shared client so keep-alive connections to Tavily are reused across calls
+_CLIENT = httpx.Client(
+    timeout=6.0,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+)
+atexit.register(_CLIENT.close)
+
+# Async counterpart for _arun, closed on application shutdown
+_ACLIENT = httpx.AsyncClient(
+    timeout=6.0,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+)
+
+# Tavily API endpoint
+_SEARCH_URL = "https://api.tavily.com/search"
+
+# Transient failures (timeouts, 429, 5xx) are retried once with jittered backoff
+RETRY_ATTEMPTS = 2
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 1.0
+
+# After this many consecutive transient failures, fail fast for BREAKER_RESET_SECONDS
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_SECONDS = 30.0
+
+_UNAVAILABLE_MESSAGE = "❌ Tavily search is temporarily unavailable. Please try again shortly."
+
+
+def _is_transient(e: Exception) -> bool:
+    """Whether a failed request is worth retrying (and counts against the breaker)."""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code == 429 or e.response.status_code >= 500
+    return isinstance(e, httpx.TransportError)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given (0-based) retry attempt."""
+    delay = RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, RETRY_BASE_DELAY)
+    return min(delay, RETRY_MAX_DELAY)
+
+
+class _CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after `fail_max` transient failures in a row. While open, calls are
+    rejected until `reset_seconds` have passed; a single probe call is then let
+    through (half-open) and either closes the breaker (success) or re-opens it
+    (failure). Other calls keep failing fast while the probe is in flight. A
+    probe that never reports back (e.g. its caller was cancelled) is replaced
+    after another `reset_seconds`.
+    """
+
+    def __init__(self, fail_max: int, reset_seconds: float):
+        self.fail_max = fail_max
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_seconds:
+                return False
+            if self._probe_started_at is not None and now - self._probe_started_at < self.reset_seconds:
+                return False
+
+            self._probe_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                if self._opened_at is None:
+                    logger.warning(f"Tavily circuit breaker opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+                self._probe_started_at = None
+
+
+_BREAKER = _CircuitBreaker(BREAKER_FAIL_MAX, BREAKER_RESET_SECONDS)
+
 
 class TavilySearchInput(BaseModel):
     """Input schema for Tavily search tool."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     query: str = Field(description="The search query to look up on the web")
 
 
@@ -61,59 +163,116 @@ class TavilySearchTool(BaseTool):
         Returns:
             Synthesized search results with sources
         """
+        if not _BREAKER.allow():
+            return _UNAVAILABLE_MESSAGE
+
         try:
             logger.info(f"Performing Tavily web search for: {query}")
 
-            # Tavily API endpoint
-            url = "https://api.tavily.com/search"
-
-            # Request payload
-            payload = {
-                "api_key": settings.TAVILY_API_KEY,
-                "query": query,
-                "search_depth": "basic",  # or "advanced" for more thorough search
-                "include_answer": True,   # Get AI-generated answer
-                "include_raw_content": False,
-                "max_results": 5
-            }
-
-            # Make request
-            with httpx.Client(timeout=15.0) as client:
-                response = client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-
-            # Extract results
-            if "answer" in data and data["answer"]:
-                # Tavily provides a synthesized answer
-                result = data["answer"]
-
-                # Add sources if available
-                if "results" in data and data["results"]:
-                    sources = []
-                    for idx, item in enumerate(data["results"][:3], 1):
-                        title = item.get("title", "Unknown")
-                        url = item.get("url", "")
-                        sources.append(f"{idx}. {title}\n   {url}")
-
-                    if sources:
-                        result += "\n\n📚 Sources:\n" + "\n".join(sources)
-
-            elif "results" in data and data["results"]:
-                # Fallback: format raw results
-                result = f"Web search results for: {query}\n\n"
-                for idx, item in enumerate(data["results"], 1):
-                    title = item.get("title", "No title")
-                    content = item.get("content", "No description")
-                    url = item.get("url", "")
-                    result += f"{idx}. {title}\n{content}\n{url}\n\n"
+            data = self._post(self._payload(query))
+            _BREAKER.record_success()
+            return self._format_results(query, data)
+
+        except Exception as e:
+            if _is_transient(e):
+                _BREAKER.record_failure()
             else:
-                result = f"No search results found for: {query}"
+                # Tavily answered (e.g. 4xx), so the service itself is up
+                _BREAKER.record_success()
+            return self._error_message(e)
 
-            logger.info(f"Successfully retrieved Tavily search results for: {query}")
-            return result
+    async def _arun(self, query: str) -> str:
+        """Async version of _run using the shared AsyncClient."""
+        if not _BREAKER.allow():
+            return _UNAVAILABLE_MESSAGE
+
+        try:
+            logger.info(f"Performing Tavily web search for: {query}")
+
+            data = await self._apost(self._payload(query))
+            _BREAKER.record_success()
+            return self._format_results(query, data)
+
+        except Exception as e:
+            if _is_transient(e):
+                _BREAKER.record_failure()
+            else:
+                # Tavily answered (e.g. 4xx), so the service itself is up
+                _BREAKER.record_success()
+            return self._error_message(e)
+
+    @staticmethod
+    def _post(payload: dict) -> dict:
+        """POST to Tavily, retrying transient failures."""
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                response = _CLIENT.post(_SEARCH_URL, json=payload)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                if attempt == RETRY_ATTEMPTS - 1 or not _is_transient(e):
+                    raise
+                logger.warning(f"Tavily request failed ({type(e).__name__}), retrying")
+                time.sleep(_backoff_delay(attempt))
+
+    @staticmethod
+    async def _apost(payload: dict) -> dict:
+        """Async version of _post."""
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                response = await _ACLIENT.post(_SEARCH_URL, json=payload)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                if attempt == RETRY_ATTEMPTS - 1 or not _is_transient(e):
+                    raise
+                logger.warning(f"Tavily request failed ({type(e).__name__}), retrying")
+                await asyncio.sleep(_backoff_delay(attempt))
+
+    @staticmethod
+    def _payload(query: str) -> dict:
+        return {
+            "api_key": settings.TAVILY_API_KEY,
+            "query": query,
+            "search_depth": "basic",  # or "advanced" for more thorough search
+            "include_answer": True,   # Get AI-generated answer
+            "include_raw_content": False,
+            "max_results": 5
+        }
+
+    @staticmethod
+    def _format_results(query: str, data: dict) -> str:
+        """Format a Tavily response for the agent."""
+        # Extract results
+        if "answer" in data and data["answer"]:
+            # Tavily provides a synthesized answer
+            result = data["answer"]
 
-        except httpx.HTTPStatusError as e:
+            # Add sources if available
+            if "results" in data and data["results"]:
+                sources = "\n".join(
+                    f"{idx}. {item.get('title', 'Unknown')}\n   {item.get('url', '')}"
+                    for idx, item in enumerate(data["results"][:3], 1)
+                )
+                result += "\n\n📚 Sources:\n" + sources
+
+        elif "results" in data and data["results"]:
+            # Fallback: format raw results
+            result = f"Web search results for: {query}\n\n" + "".join(
+                f"{idx}. {item.get('title', 'No title')}\n"
+                f"{item.get('content', 'No description')}\n"
+                f"{item.get('url', '')}\n\n"
+                for idx, item in enumerate(data["results"], 1)
+            )
+        else:
+            result = f"No search results found for: {query}"
+
+        logger.info(f"Successfully retrieved Tavily search results for: {query}")
+        return result
+
+    @staticmethod
+    def _error_message(e: Exception) -> str:
+        if isinstance(e, httpx.HTTPStatusError):
             if e.response.status_code == 401:
                 error_msg = "Tavily API key is invalid or missing. Please check TAVILY_API_KEY in .env file."
             elif e.response.status_code == 429:
@@ -123,21 +282,35 @@ class TavilySearchTool(BaseTool):
             logger.error(error_msg)
             return f"❌ {error_msg}"
 
-        except httpx.TimeoutException:
+        if isinstance(e, httpx.TimeoutException):
             error_msg = "Tavily search timed out. Please try again."
             logger.error(error_msg)
             return f"❌ {error_msg}"
 
-        except Exception as e:
-            error_msg = f"Error performing Tavily search: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            return f"❌ {error_msg}"
+        error_msg = f"Error performing Tavily search: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return f"❌ {error_msg}"
 
-    async def _arun(self, query: str) -> str:
-        """Async version (falls back to sync)."""
-        return self._run(query)
+
+# Singleton instance
+_tavily_search_tool_instance = None
 
 
 def get_tavily_search_tool() -> TavilySearchTool:
-    """Factory function to create Tavily search tool instance."""
-    return TavilySearchTool()
+    """
+    Get or create the Tavily search tool instance (singleton).
+
+    Returns:
+        TavilySearchTool instance
+    """
+    global _tavily_search_tool_instance
+
+    if _tavily_search_tool_instance is None:
+        _tavily_search_tool_instance = TavilySearchTool()
+
+    return _tavily_search_tool_instance
+
+
+async def close_async_client() -> None:
+    """Close the shared AsyncClient (called on application shutdown)."""
+    await _ACLIENT.aclose()
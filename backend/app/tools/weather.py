@@ -2,16 +2,105 @@
 Weather Tool using Open-Meteo API (free, no API key needed).
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
-from typing import Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Hashable, Mapping, Optional, Tuple, Type
+from collections import OrderedDict
+import atexit
 import httpx
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Shared client so keep-alive connections to Open-Meteo are reused across calls
+_CLIENT = httpx.Client(
+    timeout=10.0,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+)
+atexit.register(_CLIENT.close)
+
+# Async counterpart for _arun, closed on application shutdown
+_ACLIENT = httpx.AsyncClient(
+    timeout=10.0,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+)
+
+_GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache with a fixed time-to-live per entry."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+# Geocoding results barely ever change; current conditions are refreshed every 5 minutes
+_GEO_CACHE = _TTLCache(max_size=4096, ttl_seconds=86400)      # lowercased location -> place
+_WEATHER_CACHE = _TTLCache(max_size=1024, ttl_seconds=300)    # rounded (lat, lon) -> forecast
+
+
+# WMO weather code -> description
+_WEATHER_CODES: Mapping[int, str] = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Foggy",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Moderate drizzle",
+    55: "Dense drizzle",
+    61: "Slight rain",
+    63: "Moderate rain",
+    65: "Heavy rain",
+    71: "Slight snow",
+    73: "Moderate snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Slight rain showers",
+    81: "Moderate rain showers",
+    82: "Violent rain showers",
+    85: "Slight snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail",
+    99: "Thunderstorm with heavy hail"
+}
+
+# Same table indexed by code (all WMO codes are < 100); "" marks unused codes
+_WEATHER_CODE_TABLE: Tuple[str, ...] = tuple(_WEATHER_CODES.get(code, "") for code in range(100))
+
 
 class WeatherInput(BaseModel):
     """Input schema for weather tool."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     location: str = Field(description="City name or location to get weather for")
 
 
@@ -50,61 +139,114 @@ class WeatherTool(BaseTool):
             logger.info(f"Getting weather for: {location}")
 
             # Step 1: Geocode the location (get coordinates)
-            geocode_url = "https://geocoding-api.open-meteo.com/v1/search"
-            geocode_params = {
-                "name": location,
-                "count": 1,
-                "language": "en",
-                "format": "json"
-            }
-
-            with httpx.Client(timeout=10.0) as client:
-                geo_response = client.get(geocode_url, params=geocode_params)
-                geo_data = geo_response.json()
-
-                if "results" not in geo_data or not geo_data["results"]:
+            location_key = location.strip().lower()
+            place = _GEO_CACHE.get(location_key)
+            if place is None:
+                geo_response = _CLIENT.get(_GEOCODE_URL, params=self._geocode_params(location))
+                place = self._parse_place(geo_response.json())
+                if place is None:
+                    return f"❌ Could not find location: {location}. Please try a different city name."
+                _GEO_CACHE.set(location_key, place)
+
+            # Step 2: Get weather data
+            coords_key = self._coords_key(place)
+            weather_data = _WEATHER_CACHE.get(coords_key)
+            if weather_data is None:
+                weather_response = _CLIENT.get(_FORECAST_URL, params=self._forecast_params(place))
+                weather_data = weather_response.json()
+                if "current" in weather_data:
+                    _WEATHER_CACHE.set(coords_key, weather_data)
+
+            return self._format_weather(place, weather_data)
+
+        except Exception as e:
+            return self._error_message(e)
+
+    async def _arun(self, location: str) -> str:
+        """Async version of _run using the shared AsyncClient."""
+        try:
+            logger.info(f"Getting weather for: {location}")
+
+            location_key = location.strip().lower()
+            place = _GEO_CACHE.get(location_key)
+            if place is None:
+                geo_response = await _ACLIENT.get(_GEOCODE_URL, params=self._geocode_params(location))
+                place = self._parse_place(geo_response.json())
+                if place is None:
                     return f"❌ Could not find location: {location}. Please try a different city name."
+                _GEO_CACHE.set(location_key, place)
 
-                # Get coordinates
-                result = geo_data["results"][0]
-                latitude = result["latitude"]
-                longitude = result["longitude"]
-                city_name = result["name"]
-                country = result.get("country", "")
-
-                # Step 2: Get weather data
-                weather_url = "https://api.open-meteo.com/v1/forecast"
-                weather_params = {
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m",
-                    "timezone": "auto"
-                }
-
-                weather_response = client.get(weather_url, params=weather_params)
+            coords_key = self._coords_key(place)
+            weather_data = _WEATHER_CACHE.get(coords_key)
+            if weather_data is None:
+                weather_response = await _ACLIENT.get(_FORECAST_URL, params=self._forecast_params(place))
                 weather_data = weather_response.json()
+                if "current" in weather_data:
+                    _WEATHER_CACHE.set(coords_key, weather_data)
 
-                if "current" not in weather_data:
-                    return "❌ Could not retrieve weather data. Please try again."
+            return self._format_weather(place, weather_data)
 
-                current = weather_data["current"]
+        except Exception as e:
+            return self._error_message(e)
+
+    @staticmethod
+    def _geocode_params(location: str) -> dict:
+        return {
+            "name": location,
+            "count": 1,
+            "language": "en",
+            "format": "json"
+        }
 
-                # Map weather codes to descriptions
-                weather_code = current.get("weather_code", 0)
-                condition = self._get_weather_condition(weather_code)
+    @staticmethod
+    def _parse_place(geo_data: dict) -> Optional[Tuple[float, float, str, str]]:
+        """Extract (latitude, longitude, city, country) from a geocoding response."""
+        if "results" not in geo_data or not geo_data["results"]:
+            return None
+
+        result = geo_data["results"][0]
+        return result["latitude"], result["longitude"], result["name"], result.get("country", "")
+
+    @staticmethod
+    def _coords_key(place: Tuple[float, float, str, str]) -> Tuple[float, float]:
+        """Weather cache key: coordinates rounded to ~1 km."""
+        return round(place[0], 2), round(place[1], 2)
+
+    @staticmethod
+    def _forecast_params(place: Tuple[float, float, str, str]) -> dict:
+        latitude, longitude, _, _ = place
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m",
+            "timezone": "auto"
+        }
 
-                # Format response
-                temp_c = current.get("temperature_2m", "N/A")
-                feels_like_c = current.get("apparent_temperature", "N/A")
-                humidity = current.get("relative_humidity_2m", "N/A")
-                wind_speed = current.get("wind_speed_10m", "N/A")
-                precipitation = current.get("precipitation", 0)
+    def _format_weather(self, place: Tuple[float, float, str, str], weather_data: dict) -> str:
+        """Format a forecast response for the agent."""
+        latitude, longitude, city_name, country = place
 
-                # Convert to Fahrenheit
-                temp_f = round((temp_c * 9/5) + 32, 1) if temp_c != "N/A" else "N/A"
-                feels_like_f = round((feels_like_c * 9/5) + 32, 1) if feels_like_c != "N/A" else "N/A"
+        if "current" not in weather_data:
+            return "❌ Could not retrieve weather data. Please try again."
 
-                response = f"""🌤️ Weather for {city_name}, {country}
+        current = weather_data["current"]
+
+        # Map weather codes to descriptions
+        weather_code = current.get("weather_code", 0)
+        condition = self._get_weather_condition(weather_code)
+
+        # Format response
+        temp_c = current.get("temperature_2m", "N/A")
+        feels_like_c = current.get("apparent_temperature", "N/A")
+        humidity = current.get("relative_humidity_2m", "N/A")
+        wind_speed = current.get("wind_speed_10m", "N/A")
+        precipitation = current.get("precipitation", 0)
+
+        # Convert to Fahrenheit
+        temp_f = round((temp_c * 9/5) + 32, 1) if temp_c != "N/A" else "N/A"
+        feels_like_f = round((feels_like_c * 9/5) + 32, 1) if feels_like_c != "N/A" else "N/A"
+
+        response = f"""🌤️ Weather for {city_name}, {country}
 
 📍 Location: {latitude}°N, {longitude}°E
 
@@ -116,15 +258,17 @@ class WeatherTool(BaseTool):
 🌧️ Precipitation: {precipitation} mm
 """
 
-                logger.info(f"Successfully retrieved weather for {city_name}")
-                return response
+        logger.info(f"Successfully retrieved weather for {city_name}")
+        return response
 
-        except httpx.TimeoutException:
+    @staticmethod
+    def _error_message(e: Exception) -> str:
+        if isinstance(e, httpx.TimeoutException):
             return "❌ Weather service timed out. Please try again."
-        except Exception as e:
-            error_msg = f"Error getting weather: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            return f"❌ {error_msg}"
+
+        error_msg = f"Error getting weather: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return f"❌ {error_msg}"
 
     def _get_weather_condition(self, code: int) -> str:
         """
@@ -136,40 +280,34 @@ class WeatherTool(BaseTool):
         Returns:
             Weather condition description
         """
-        weather_codes = {
-            0: "Clear sky",
-            1: "Mainly clear",
-            2: "Partly cloudy",
-            3: "Overcast",
-            45: "Foggy",
-            48: "Depositing rime fog",
-            51: "Light drizzle",
-            53: "Moderate drizzle",
-            55: "Dense drizzle",
-            61: "Slight rain",
-            63: "Moderate rain",
-            65: "Heavy rain",
-            71: "Slight snow",
-            73: "Moderate snow",
-            75: "Heavy snow",
-            77: "Snow grains",
-            80: "Slight rain showers",
-            81: "Moderate rain showers",
-            82: "Violent rain showers",
-            85: "Slight snow showers",
-            86: "Heavy snow showers",
-            95: "Thunderstorm",
-            96: "Thunderstorm with slight hail",
-            99: "Thunderstorm with heavy hail"
-        }
+        # The API may send whole-number floats (3.0); they index like ints, as with a dict
+        description = ""
+        if isinstance(code, (int, float)) and float(code).is_integer():
+            idx = int(code)
+            if 0 <= idx < len(_WEATHER_CODE_TABLE):
+                description = _WEATHER_CODE_TABLE[idx]
+        return description or f"Unknown (code: {code})"
 
-        return weather_codes.get(code, f"Unknown (code: {code})")
 
-    async def _arun(self, location: str) -> str:
-        """Async version (falls back to sync)."""
-        return self._run(location)
+# Singleton instance
+_weather_tool_instance = None
 
 
 def get_weather_tool() -> WeatherTool:
-    """Factory function to create weather tool instance."""
-    return WeatherTool()
+    """
+    Get or create the weather tool instance (singleton).
+
+    Returns:
+        WeatherTool instance
+    """
+    global _weather_tool_instance
+
+    if _weather_tool_instance is None:
+        _weather_tool_instance = WeatherTool()
+
+    return _weather_tool_instance
+
+
+async def close_async_client() -> None:
+    """Close the shared AsyncClient (called on application shutdown)."""
+    await _ACLIENT.aclose()
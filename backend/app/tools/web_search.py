@@ -2,16 +2,22 @@
 Web Search Tool using DuckDuckGo.
 """
 from langchain.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Type
 from duckduckgo_search import DDGS
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared DuckDuckGo client (keeps its HTTP session between searches)
+_DDGS = DDGS()
+
 
 class WebSearchInput(BaseModel):
     """Input schema for web search tool."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     query: str = Field(description="The search query to look up on the web")
     max_results: Optional[int] = Field(
         default=5,
@@ -52,11 +58,8 @@ class WebSearchTool(BaseTool):
         try:
             logger.info(f"Performing web search for: {query}")
 
-            # Initialize DuckDuckGo search
-            ddgs = DDGS()
-
             # Perform search
-            results = list(ddgs.text(query, max_results=max_results))
+            results = list(_DDGS.text(query, max_results=max_results))
 
             if not results:
                 return f"No search results found for: {query}"
@@ -86,10 +89,29 @@ class WebSearchTool(BaseTool):
             return error_msg
 
     async def _arun(self, query: str, max_results: int = 5) -> str:
-        """Async version of _run (not implemented, falls back to sync)."""
-        return self._run(query, max_results)
+        """
+        Async version of _run.
+
+        duckduckgo-search 7.x has no async client (AsyncDDGS was removed), so the
+        blocking search runs in a worker thread instead of on the event loop.
+        """
+        return await asyncio.to_thread(self._run, query, max_results)
+
+
+# Singleton instance
+_web_search_tool_instance = None
 
 
 def get_web_search_tool() -> WebSearchTool:
-    """Factory function to create web search tool instance."""
-    return WebSearchTool()
+    """
+    Get or create the web search tool instance (singleton).
+
+    Returns:
+        WebSearchTool instance
+    """
+    global _web_search_tool_instance
+
+    if _web_search_tool_instance is None:
+        _web_search_tool_instance = WebSearchTool()
+
+    return _web_search_tool_instance